@@ -1,21 +1,38 @@
+from functools import cache
 from typing import Literal, Mapping
-import platform
+import sys
 
 NAME = "toad"
 TITLE = "Toad"
 
 type OS = Literal["linux", "macos", "windows", "*"]
 
-_system = platform.system()
-_OS_map: dict[str, OS] = {
-    "Linux": "linux",
-    "Darwin": "macos",
-    "Windows": "windows",
-}
-os: OS = _OS_map.get(_system, "linux")
+os: OS
+"""The current OS, detected on first access."""
 
 
-def get_os_matrix(matrix: Mapping[OS, str]) -> str | None:
+@cache
+def _detect_os() -> OS:
+    """Detect the current OS.
+
+    Returns:
+        An OS literal.
+    """
+    # `sys.platform` is a constant, whereas `platform.system()` may need to call out to the OS.
+    if sys.platform == "darwin":
+        return "macos"
+    elif sys.platform == "win32":
+        return "windows"
+    return "linux"
+
+
+def __getattr__(name: str) -> object:
+    if name == "os":
+        return _detect_os()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_os_matrix[ValueType](matrix: Mapping[OS, ValueType]) -> ValueType | None:
     """Get a value from a mapping where the key is an OS, falling back to a wildcard ("*").
 
     Args:
@@ -24,7 +41,7 @@ def get_os_matrix(matrix: Mapping[OS, str]) -> str | None:
     Returns:
         The value, if one is found, or `None`.
     """
-    if (result := matrix.get(os)) is None:
+    if (result := matrix.get(_detect_os())) is None:
         result = matrix.get("*")
     return result
 
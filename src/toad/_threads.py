@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Callable
+
+MAX_IO_WORKERS = 8
+"""Maximum number of threads for file system I/O."""
+
+
+@cache
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get a thread pool shared by file system I/O (created on first call).
+
+    Returns:
+        A thread pool executor.
+    """
+    return ThreadPoolExecutor(max_workers=MAX_IO_WORKERS, thread_name_prefix="toad-io")
+
+
+def shutdown_io_executor() -> None:
+    """Shut down the shared I/O thread pool, if it was created.
+
+    Pending work is cancelled. A new pool is created if `run_in_thread` is called
+    again.
+    """
+    if get_io_executor.cache_info().currsize:
+        get_io_executor().shutdown(wait=False, cancel_futures=True)
+        get_io_executor.cache_clear()
+
+
+def run_in_thread[T](func: Callable[..., T], *args: object) -> asyncio.Future[T]:
+    """Run a function in the shared I/O thread pool.
+
+    Unlike `asyncio.to_thread`, this doesn't copy the current context, which is
+    unnecessary for functions that don't read any context variables.
+
+    Args:
+        func: Function to run.
+        *args: Positional arguments for the function.
+
+    Returns:
+        A future for the function's return value.
+    """
+    return asyncio.get_running_loop().run_in_executor(get_io_executor(), func, *args)
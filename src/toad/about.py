@@ -1,15 +1,14 @@
 import os
+from functools import lru_cache
 from importlib.metadata import version
 import platform
-from string import Template
 
 from toad.app import ToadApp
 from toad import paths
 from toad import get_version
 
-ABOUT_TEMPLATE = Template(
-    """\
-# About Toad v${TOAD_VERSION}
+ABOUT_TEMPLATE = """\
+# About Toad v{TOAD_VERSION}
 
 © Will McGugan.
                           
@@ -18,45 +17,68 @@ Toad is licensed under the terms of the [GNU AFFERO GENERAL PUBLIC LICENSE](http
 
 ## Config
 
-config read from `$SETTINGS_PATH`
+config read from `{SETTINGS_PATH}`
                                        
 ```json
-$CONFIG                       
+{CONFIG}                       
 ```
 
 ## Paths
 
 | Name | Path |
 | --- | --- |
-| App data | `$DATA_PATH` |
-| App logs | `$LOG_PATH` |
+| App data | `{DATA_PATH}` |
+| App logs | `{LOG_PATH}` |
                           
 ## System
 
 | System | Version |
 | --- | --- |
-| Python | $PYTHON |
-| OS | $PLATFORM |
+| Python | {PYTHON} |
+| OS | {PLATFORM} |
 
 ## Dependencies
 
 | Library | Version |
 | --- | --- | 
-| Toad | $TOAD_VERSION |
-| Textual | $TEXTUAL_VERSION |
-| Rich | $RICH_VERSION |
+| Toad | {TOAD_VERSION} |
+| Textual | {TEXTUAL_VERSION} |
+| Rich | {RICH_VERSION} |
                           
 ## Environment
 
 | Environment variable | Value |                
 | --- | --- |
-| `SHELL` | $SHELL |
-| `TERM` | $TERM |
-| `COLORTERM` | $COLORTERM |
-| `TERM_PROGRAM` | $TERM_PROGRAM |
-| `TERM_PROGRAM_VERSION` | $TERM_PROGRAM_VERSION |
+| `SHELL` | {SHELL} |
+| `TERM` | {TERM} |
+| `COLORTERM` | {COLORTERM} |
+| `TERM_PROGRAM` | {TERM_PROGRAM} |
+| `TERM_PROGRAM_VERSION` | {TERM_PROGRAM_VERSION} |
 """
-)
+
+
+@lru_cache(maxsize=1)
+def get_static_data() -> dict[str, str]:
+    """Get template data which won't change for the lifetime of the process.
+
+    Includes the terminal related environment variables, which are read once.
+
+    Returns:
+        A dict of template data.
+    """
+    environ = os.environ
+    return {
+        "COLORTERM": environ.get("COLORTERM", ""),
+        "PLATFORM": platform.platform(),
+        "PYTHON": f"{platform.python_implementation()} {platform.python_version()}",
+        "RICH_VERSION": version("rich"),
+        "SHELL": environ.get("SHELL", ""),
+        "TERM_PROGRAM_VERSION": environ.get("TERM_PROGRAM_VERSION", ""),
+        "TERM_PROGRAM": environ.get("TERM_PROGRAM", ""),
+        "TERM": environ.get("TERM", ""),
+        "TEXTUAL_VERSION": version("textual"),
+        "TOAD_VERSION": get_version(),
+    }
 
 
 def render(app: ToadApp) -> str:
@@ -72,19 +94,10 @@ def render(app: ToadApp) -> str:
         config = None
 
     template_data = {
-        "COLORTERM": os.environ.get("COLORTERM", ""),
+        **get_static_data(),
         "CONFIG": config,
         "DATA_PATH": paths.get_data(),
         "LOG_PATH": paths.get_log(),
-        "PLATFORM": platform.platform(),
-        "PYTHON": f"{platform.python_implementation()} {platform.python_version()}",
-        "RICH_VERSION": version("rich"),
         "SETTINGS_PATH": str(app.settings_path),
-        "SHELL": os.environ.get("SHELL", ""),
-        "TERM_PROGRAM_VERSION": os.environ.get("TERM_PROGRAM_VERSION", ""),
-        "TERM_PROGRAM": os.environ.get("TERM_PROGRAM", ""),
-        "TERM": os.environ.get("TERM", ""),
-        "TEXTUAL_VERSION": version("textual"),
-        "TOAD_VERSION": get_version(),
     }
-    return ABOUT_TEMPLATE.safe_substitute(template_data)
+    return ABOUT_TEMPLATE.format_map(template_data)
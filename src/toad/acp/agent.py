@@ -2,10 +2,13 @@ import asyncio
 
 from contextlib import suppress
 from datetime import datetime
-import json
+from itertools import islice
 import os
 from pathlib import Path
-from typing import Any, cast, NamedTuple
+import shlex
+from queue import SimpleQueue
+from threading import Thread
+from typing import Any, AsyncIterator, Callable, cast, NamedTuple
 from copy import deepcopy
 
 import rich.repr
@@ -29,6 +32,9 @@ from toad.answer import Answer
 
 PROTOCOL_VERSION = 1
 
+SHELL_SYNTAX = frozenset("|&;<>()$`*?[]{}~!#\n")
+"""Characters which indicate a command requires a shell."""
+
 
 class Mode(NamedTuple):
     """An agent mode."""
@@ -63,6 +69,74 @@ def generate_datetime_filename(
     return file_name_stem + suffix
 
 
+def split_command(command: str) -> list[str] | None:
+    """Split a command in to arguments, if it may be run without a shell.
+
+    Args:
+        command: A command line.
+
+    Returns:
+        A list of arguments, or `None` if the command should be run in a shell.
+    """
+    if toad.os == "windows" or not SHELL_SYNTAX.isdisjoint(command):
+        return None
+    try:
+        arguments = shlex.split(command)
+    except ValueError:
+        return None
+    if not arguments or "=" in arguments[0]:
+        # Empty, or starts with an environment variable assignment
+        return None
+    return arguments
+
+
+MAX_LINE_LENGTH = 10 * 1024 * 1024
+"""Maximum length of a line of data from the agent."""
+
+
+async def read_lines(
+    reader: asyncio.StreamReader,
+    chunk_size: int = 64 * 1024,
+    limit: int = MAX_LINE_LENGTH,
+) -> AsyncIterator[bytes]:
+    """Read newline delimited data from a stream.
+
+    Reads large chunks and splits them in to lines, which requires fewer awaits than
+    calling `readline` for every line.
+
+    Args:
+        reader: A stream reader.
+        chunk_size: Maximum number of bytes to read at once.
+        limit: Maximum length of an incomplete line.
+
+    Raises:
+        ValueError: If a line exceeds the limit (as `StreamReader.readline` would).
+
+    Yields:
+        Lines of data (without the newline).
+    """
+    buffer = bytearray()
+    while chunk := await reader.read(chunk_size):
+        if b"\n" not in chunk:
+            buffer.extend(chunk)
+            if len(buffer) > limit:
+                raise ValueError(f"Line exceeds the limit of {limit} bytes")
+            continue
+        *lines, remainder = chunk.split(b"\n")
+        if buffer:
+            buffer.extend(lines[0])
+            lines[0] = bytes(buffer)
+        for line in lines:
+            yield line
+        # Reuse the buffer, rather than allocating a new one for every chunk
+        buffer.clear()
+        buffer.extend(remainder)
+        if len(buffer) > limit:
+            raise ValueError(f"Line exceeds the limit of {limit} bytes")
+    if buffer:
+        yield bytes(buffer)
+
+
 @rich.repr.auto
 class Agent(AgentBase):
     """An agent that speaks the APC (https://agentclientprotocol.com/overview/introduction) protocol."""
@@ -84,6 +158,9 @@ class Agent(AgentBase):
         self._agent_task: asyncio.Task | None = None
         self._task: asyncio.Task | None = None
         self._process: asyncio.subprocess.Process | None = None
+        self._write_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._log_queue: SimpleQueue[str | None] = SimpleQueue()
+        self._log_thread: Thread | None = None
         self.done_event = asyncio.Event()
 
         self.agent_capabilities: protocol.AgentCapabilities = {
@@ -101,6 +178,19 @@ class Agent(AgentBase):
 
         self._terminal_count: int = 0
 
+        # Handlers for session updates, keyed on the "sessionUpdate" field
+        self._session_update_handlers: dict[
+            str | None, Callable[[protocol.SessionUpdate], None]
+        ] = {
+            "agent_message_chunk": self._update_agent_message_chunk,
+            "agent_thought_chunk": self._update_agent_thought_chunk,
+            "tool_call": self._update_tool_call,
+            "plan": self._update_plan,
+            "tool_call_update": self._update_tool_call_update,
+            "available_commands_update": self._update_available_commands,
+            "current_mode_update": self._update_current_mode,
+        }
+
         log_filename: str = generate_datetime_filename(f"{agent['name']}", ".txt")
         if log_path := os.environ.get("TOAD_LOG"):
             self._log_file_path = Path(log_path).resolve().absolute()
@@ -126,30 +216,43 @@ class Agent(AgentBase):
             line: Text to be logged.
 
         """
-        if self._message_target is not None:
-            self._message_target.call_later(self._log, line)
+        if self._message_target is not None and self._log_thread is not None:
+            self._log_queue.put(line)
 
-    async def _log(self, line: str) -> None:
-        """Write text to the agent log file.
-
-        Intended to be called from `log`
+    def _write_log(self) -> None:
+        """Write queued lines to the agent log file.
 
-        Args:
-            line: Text to be logged.
+        Runs in a thread, until `None` is queued.
         """
-
-        if self._message_target is None:
-            return
-
-        def write_log(log_file_path: Path, line: str):
-            """Write log in a thread."""
-            try:
-                with log_file_path.open("at") as log_file:
-                    log_file.write(f"{line.rstrip()}\n")
-            except OSError:
-                pass
-
-        await asyncio.to_thread(write_log, self._log_file_path, line)
+        log_queue = self._log_queue
+        try:
+            log_file = self._log_file_path.open("at")
+        except OSError:
+            log_file = None
+        try:
+            running = True
+            while running:
+                lines: list[str] = []
+                line = log_queue.get()
+                # Write whatever else has been queued in one go
+                while True:
+                    if line is None:
+                        running = False
+                        break
+                    lines.append(line)
+                    if log_queue.empty():
+                        break
+                    line = log_queue.get()
+                if log_file is None or not lines:
+                    continue
+                try:
+                    log_file.write("".join(f"{line.rstrip()}\n" for line in lines))
+                    log_file.flush()
+                except OSError:
+                    pass
+        finally:
+            if log_file is not None:
+                log_file.close()
 
     def get_info(self) -> Content:
         agent_name = self._agent_data["name"]
@@ -162,6 +265,8 @@ class Agent(AgentBase):
             self._log_file_path.parent.mkdir(parents=True, exist_ok=True)
         except OSError:
             pass
+        self._log_thread = Thread(target=self._write_log, name="agent-log", daemon=True)
+        self._log_thread.start()
         self._agent_task = asyncio.create_task(self._run_agent())
 
     def send(self, request: jsonrpc.Request) -> None:
@@ -175,9 +280,9 @@ class Agent(AgentBase):
         """
         assert self._process is not None, "Process should be present here"
 
-        self.log(f"[client] {request.body}")
-        if (stdin := self._process.stdin) is not None:
-            stdin.write(b"%s\n" % request.body_json)
+        body_json = request.body_json
+        self.log(f"[client] {body_json.decode('utf-8')}")
+        self._write_queue.put_nowait(b"%s\n" % body_json)
 
     def request(self) -> jsonrpc.Request:
         """Create a request object."""
@@ -214,33 +319,37 @@ class Agent(AgentBase):
             ) is not None:
                 status_line = open_hands_metrics.get("status_line")
 
+        session_update = update.get("sessionUpdate")
+        if (handler := self._session_update_handlers.get(session_update)) is not None:
+            handler(update)
+
+        if status_line is not None:
+            self.post_message(messages.UpdateStatusLine(status_line))
+
+    def _update_agent_message_chunk(self, update: protocol.SessionUpdate) -> None:
         match update:
-            case {
-                "sessionUpdate": "agent_message_chunk",
-                "content": {"type": type, "text": text},
-            }:
+            case {"content": {"type": type, "text": text}}:
                 self.post_message(messages.Update(type, text))
 
-            case {
-                "sessionUpdate": "agent_thought_chunk",
-                "content": {"type": type, "text": text},
-            }:
+    def _update_agent_thought_chunk(self, update: protocol.SessionUpdate) -> None:
+        match update:
+            case {"content": {"type": type, "text": text}}:
                 self.post_message(messages.Thinking(type, text))
 
-            case {
-                "sessionUpdate": "tool_call",
-                "toolCallId": tool_call_id,
-            }:
+    def _update_tool_call(self, update: protocol.SessionUpdate) -> None:
+        match update:
+            case {"toolCallId": tool_call_id}:
                 self.tool_calls[tool_call_id] = update
                 self.post_message(messages.ToolCall(update))
 
-            case {"sessionUpdate": "plan", "entries": entries}:
+    def _update_plan(self, update: protocol.SessionUpdate) -> None:
+        match update:
+            case {"entries": entries}:
                 self.post_message(messages.Plan(entries))
 
-            case {
-                "sessionUpdate": "tool_call_update",
-                "toolCallId": tool_call_id,
-            }:
+    def _update_tool_call_update(self, update: protocol.SessionUpdate) -> None:
+        match update:
+            case {"toolCallId": tool_call_id}:
                 if tool_call_id in self.tool_calls:
                     current_tool_call = self.tool_calls[tool_call_id]
                     for key, value in update.items():
@@ -264,18 +373,16 @@ class Agent(AgentBase):
                     self.tool_calls[tool_call_id] = current_tool_call
                     self.post_message(messages.ToolCall(current_tool_call))
 
-            case {
-                "sessionUpdate": "available_commands_update",
-                "availableCommands": available_commands,
-            }:
+    def _update_available_commands(self, update: protocol.SessionUpdate) -> None:
+        match update:
+            case {"availableCommands": available_commands}:
                 self.post_message(messages.AvailableCommandsUpdate(available_commands))
 
-            case {"sessionUpdate": "current_mode_update", "currentModeId": mode_id}:
+    def _update_current_mode(self, update: protocol.SessionUpdate) -> None:
+        match update:
+            case {"currentModeId": mode_id}:
                 self.post_message(messages.ModeUpdate(mode_id))
 
-        if status_line is not None:
-            self.post_message(messages.UpdateStatusLine(status_line))
-
     @jsonrpc.expose("session/request_permission")
     async def rpc_request_permission(
         self,
@@ -335,15 +442,18 @@ class Agent(AgentBase):
         # https://agentclientprotocol.com/protocol/file-system#reading-files
         read_path = self.project_root_path / path
         try:
-            text = read_path.read_text(encoding="utf-8", errors="ignore")
+            if line is None:
+                text = read_path.read_text(encoding="utf-8", errors="ignore")
+            else:
+                # Read only the requested lines, rather than the whole file
+                line = max(0, line - 1)
+                end = None if limit is None else line + limit
+                with read_path.open("rt", encoding="utf-8", errors="ignore") as file:
+                    text = "\n".join(
+                        file_line.rstrip("\n") for file_line in islice(file, line, end)
+                    )
         except IOError:
             text = ""
-        if line is not None:
-            line = max(0, line - 1)
-            if limit is None:
-                text = "\n".join(text.splitlines()[line:])
-            else:
-                text = "\n".join(text.splitlines()[line : line + limit])
         return {"content": text}
 
     @jsonrpc.expose("fs/write_text_file")
@@ -445,7 +555,23 @@ class Agent(AgentBase):
         return {"exitCode": return_code, "signal": signal}
 
     async def _run_agent(self) -> None:
-        """Task to communicate with the agent subprocess."""
+        """Task to run the agent, and close the log when it is done."""
+        try:
+            await self._communicate()
+        finally:
+            await self._close_log()
+
+    async def _close_log(self) -> None:
+        """Stop logging, and wait for queued lines to be written."""
+        if (log_thread := self._log_thread) is None:
+            return
+        # Further lines won't be queued
+        self._log_thread = None
+        self._log_queue.put(None)
+        await asyncio.to_thread(log_thread.join)
+
+    async def _communicate(self) -> None:
+        """Communicate with the agent subprocess."""
 
         PIPE = asyncio.subprocess.PIPE
         env = os.environ.copy()
@@ -458,15 +584,28 @@ class Agent(AgentBase):
             return
 
         try:
-            process = self._process = await asyncio.create_subprocess_shell(
-                command,
-                stdin=PIPE,
-                stdout=PIPE,
-                stderr=PIPE,
-                env=env,
-                cwd=str(self.project_root_path),
-                limit=10 * 1024 * 1024,
-            )
+            if (arguments := split_command(command)) is None:
+                process = await asyncio.create_subprocess_shell(
+                    command,
+                    stdin=PIPE,
+                    stdout=PIPE,
+                    stderr=PIPE,
+                    env=env,
+                    cwd=str(self.project_root_path),
+                    limit=MAX_LINE_LENGTH,
+                )
+            else:
+                # Simple commands don't need the overhead of launching a shell
+                process = await asyncio.create_subprocess_exec(
+                    *arguments,
+                    stdin=PIPE,
+                    stdout=PIPE,
+                    stderr=PIPE,
+                    env=env,
+                    cwd=str(self.project_root_path),
+                    limit=MAX_LINE_LENGTH,
+                )
+            self._process = process
         except Exception as error:
             self.post_message(AgentFail("Failed to start agent", details=str(error)))
             return
@@ -477,73 +616,97 @@ class Agent(AgentBase):
         assert process.stdin is not None
 
         tasks: set[asyncio.Task] = set()
+        write_task = asyncio.create_task(self._write_agent(process.stdin))
 
         async def call_jsonrpc(request: jsonrpc.JSONObject | jsonrpc.JSONList) -> None:
             try:
-                if (result := await self.server.call(request)) is not None:
-                    result_json = json.dumps(result).encode("utf-8")
-                    if process.stdin is not None:
-                        process.stdin.write(b"%s\n" % result_json)
+                if (result_json := await self.server.call_encoded(request)) is not None:
+                    self._write_queue.put_nowait(b"%s\n" % result_json)
             finally:
                 if (task := asyncio.current_task()) is not None:
                     tasks.discard(task)
 
-        while line := await process.stdout.readline():
-            # This line should contain JSON, which may be:
-            #   A) a JSONRPC request
-            #   B) a JSONRPC response to a previous request
-            if not line.strip():
-                continue
-
-            try:
-                line_str = line.decode("utf-8")
-            except Exception as error:
-                self.log(f"[error] Unable to decode utf-8 from agent: {error}")
-                continue
-
-            self.log(f"[agent] {line_str}")
-            try:
-                agent_data: jsonrpc.JSONType = json.loads(line_str)
-            except Exception as error:
-                self.log(f"[error] failed to decode JSON from agent: {error}")
-                continue
-
-            if isinstance(agent_data, dict):
-                if "result" in agent_data or "error" in agent_data:
-                    API.process_response(agent_data)
+        try:
+            async for line in read_lines(process.stdout):
+                # This line should contain JSON, which may be:
+                #   A) a JSONRPC request
+                #   B) a JSONRPC response to a previous request
+                if not line or line.isspace():
                     continue
 
-            elif isinstance(agent_data, list):
-                if not all(isinstance(datum, dict) for datum in agent_data):
-                    self.log(f"[error] Agent sent invalid data: {agent_data!r}")
+                try:
+                    line_str = line.decode("utf-8")
+                except Exception as error:
+                    self.log(f"[error] Unable to decode utf-8 from agent: {error}")
                     continue
-                if all(
-                    isinstance(datum, dict) and ("result" in datum or "error" in datum)
-                    for datum in agent_data
-                ):
-                    API.process_response(agent_data)
+
+                self.log(f"[agent] {line_str}")
+                try:
+                    agent_data: jsonrpc.JSONType = jsonrpc.loads(line)
+                except Exception as error:
+                    self.log(f"[error] failed to decode JSON from agent: {error}")
                     continue
 
-            if not isinstance(agent_data, dict):
-                self.log("[error] Invalid JSON from agent {agent_data!r}")
-                continue
+                if isinstance(agent_data, dict):
+                    if "result" in agent_data or "error" in agent_data:
+                        API.process_response(agent_data)
+                        continue
+
+                elif isinstance(agent_data, list):
+                    if not all(isinstance(datum, dict) for datum in agent_data):
+                        self.log(f"[error] Agent sent invalid data: {agent_data!r}")
+                        continue
+                    if all(
+                        isinstance(datum, dict)
+                        and ("result" in datum or "error" in datum)
+                        for datum in agent_data
+                    ):
+                        API.process_response(agent_data)
+                        continue
 
-            # By this point we know it is a JSON RPC call
-            assert isinstance(agent_data, dict)
-            tasks.add(asyncio.create_task(call_jsonrpc(agent_data)))
+                else:
+                    self.log(f"[error] Invalid JSON from agent {agent_data!r}")
+                    continue
 
-        if process.returncode:
-            assert process.stderr is not None
-            fail_details = (await process.stderr.read()).decode("utf-8", "replace")
-            self.post_message(
-                AgentFail(
-                    f"Agent returned a failure code: [b]{process.returncode}",
-                    details=fail_details,
-                )
-            )
+                # By this point we know it is a JSON RPC call (or batch of calls)
+                tasks.add(asyncio.create_task(call_jsonrpc(agent_data)))
 
+            if process.returncode:
+                assert process.stderr is not None
+                fail_details = (await process.stderr.read()).decode("utf-8", "replace")
+                self.post_message(
+                    AgentFail(
+                        f"Agent returned a failure code: [b]{process.returncode}",
+                        details=fail_details,
+                    )
+                )
+        finally:
+            # Don't leave the writer running if reading fails, or is cancelled
+            write_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await write_task
         self._process = None
 
+    async def _write_agent(self, stdin: asyncio.StreamWriter) -> None:
+        """Task to write queued data to the agent subprocess.
+
+        Data queued while a write is in progress is sent in a single write.
+
+        Args:
+            stdin: The agent's stdin.
+        """
+        write_queue = self._write_queue
+        while True:
+            batch = [await write_queue.get()]
+            while not write_queue.empty():
+                batch.append(write_queue.get_nowait())
+            try:
+                stdin.write(b"".join(batch))
+                await stdin.drain()
+            except (ConnectionError, RuntimeError) as error:
+                self.log(f"[error] Unable to write to agent: {error}")
+                return
+
     async def stop(self) -> None:
         """Gracefully stop the process."""
         if self._process is not None:
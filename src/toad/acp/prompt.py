@@ -1,9 +1,94 @@
-import base64
+from functools import lru_cache
 from pathlib import Path
 
 from toad.acp import protocol
 from toad.prompt.extract import extract_paths_from_prompt
-from toad.prompt.resource import load_resource, ResourceError
+from toad.prompt.resource import load_resource, Resource, ResourceError
+
+try:
+    from pybase64 import b64encode_as_string
+except ImportError:
+    import base64
+
+    def b64encode_as_string(data: bytes) -> str:
+        """Encode data as base64.
+
+        Args:
+            data: Binary data.
+
+        Returns:
+            Base64 encoded string.
+        """
+        return base64.b64encode(data).decode("ascii")
+
+
+MAX_CACHED_RESOURCE_SIZE = 256 * 1024
+"""Largest file (in bytes) to keep in the resource cache."""
+
+
+@lru_cache(maxsize=32)
+def _load_cached_resource(
+    project_path: Path, path: str, mtime_ns: int, size: int
+) -> Resource:
+    """Load a resource, cached while the file is unchanged.
+
+    Args:
+        project_path: The project root.
+        path: Path relative to the project root.
+        mtime_ns: Modification time of the file (used as part of the cache key).
+        size: Size of the file (used as part of the cache key).
+
+    Returns:
+        A resource, which should be treated as read-only.
+    """
+    return load_resource(project_path, Path(path))
+
+
+def build_resource(
+    project_path: Path, path: str, mtime_ns: int, size: int
+) -> protocol.ContentBlock | None:
+    """Build a content block for a resource.
+
+    Small files are cached, so that files referenced in more than one prompt aren't
+    re-read if they haven't changed. A new content block is returned for each call.
+
+    Args:
+        project_path: The project root.
+        path: Path relative to the project root.
+        mtime_ns: Modification time of the file.
+        size: Size of the file.
+
+    Returns:
+        A content block, or `None` if the resource couldn't be read.
+    """
+    try:
+        if size <= MAX_CACHED_RESOURCE_SIZE:
+            resource = _load_cached_resource(project_path, path, mtime_ns, size)
+        else:
+            resource = load_resource(project_path, Path(path))
+    except ResourceError:
+        # TODO: How should this be handled?
+        return None
+    uri = f"file://{resource.path.absolute().resolve()}"
+    if resource.text is not None:
+        return {
+            "type": "resource",
+            "resource": {
+                "uri": uri,
+                "text": resource.text,
+                "mimeType": resource.mime_type,
+            },
+        }
+    elif resource.data is not None:
+        return {
+            "type": "resource",
+            "resource": {
+                "uri": uri,
+                "blob": b64encode_as_string(resource.data),
+                "mimeType": resource.mime_type,
+            },
+        }
+    return None
 
 
 def build(project_path: Path, prompt: str) -> list[protocol.ContentBlock]:
@@ -19,36 +104,21 @@ def build(project_path: Path, prompt: str) -> list[protocol.ContentBlock]:
     prompt_content: list[protocol.ContentBlock] = []
 
     prompt_content.append({"type": "text", "text": prompt})
-    for path, _, _ in extract_paths_from_prompt(prompt):
+    if "@" not in prompt:
+        # No file references; skip the regex
+        return prompt_content
+    paths = {path: None for path, _, _ in extract_paths_from_prompt(prompt)}
+    for path in paths:
         if path.endswith("/"):
             continue
         try:
-            resource = load_resource(project_path, Path(path))
-        except ResourceError:
-            # TODO: How should this be handled?
+            stat = (project_path / path).stat()
+        except OSError:
             continue
-        uri = f"file://{resource.path.absolute().resolve()}"
-        if resource.text is not None:
-            prompt_content.append(
-                {
-                    "type": "resource",
-                    "resource": {
-                        "uri": uri,
-                        "text": resource.text,
-                        "mimeType": resource.mime_type,
-                    },
-                }
-            )
-        elif resource.data is not None:
-            prompt_content.append(
-                {
-                    "type": "resource",
-                    "resource": {
-                        "uri": uri,
-                        "blob": base64.b64encode(resource.data).decode("utf-8"),
-                        "mimeType": resource.mime_type,
-                    },
-                }
-            )
+        content_block = build_resource(
+            project_path, path, stat.st_mtime_ns, stat.st_size
+        )
+        if content_block is not None:
+            prompt_content.append(content_block)
 
     return prompt_content
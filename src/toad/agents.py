@@ -1,5 +1,8 @@
 from importlib.resources import files
+from importlib.resources.abc import Traversable
 import asyncio
+from pathlib import Path
+from typing import NamedTuple
 
 from toad.agent_schema import Agent
 
@@ -8,6 +11,42 @@ class AgentReadError(Exception):
     """Problem reading the agents."""
 
 
+type CacheKey = tuple[tuple[str, int, int], ...]
+
+
+class AgentIndex(NamedTuple):
+    """Agents, and a lookup of their names."""
+
+    agents: dict[str, Agent]
+    """A mapping of identity on to Agent dict."""
+    names: dict[str, str]
+    """A mapping of lower cased short name or identity on to identity."""
+
+
+_agents_cache: dict[CacheKey, AgentIndex] = {}
+
+
+def _get_cache_key(agent_files: list[Traversable]) -> CacheKey | None:
+    """Get a key which will change if any of the agent files are modified.
+
+    Args:
+        agent_files: Agent files.
+
+    Returns:
+        A cache key, or `None` if the files can't be checked for modifications.
+    """
+    key: list[tuple[str, int, int]] = []
+    for file in agent_files:
+        if not isinstance(file, Path):
+            return None
+        try:
+            stat = file.stat()
+        except OSError:
+            return None
+        key.append((file.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(key))
+
+
 async def read_agents() -> dict[str, Agent]:
     """Read agent information from data/agents
 
@@ -17,29 +56,88 @@ async def read_agents() -> dict[str, Agent]:
     Returns:
         A mapping of identity on to Agent dict.
     """
-    import tomllib
+    agent_index = await read_agent_index()
+    return agent_index.agents
+
+
+async def find_agent(name: str) -> Agent | None:
+    """Find an agent by its short name or identity (case insensitive).
+
+    Args:
+        name: Short name or identity.
+
+    Raises:
+        AgentReadError: If the files could not be read.
+
+    Returns:
+        Agent dict, or `None` if there is no matching agent.
+    """
+    agents, names = await read_agent_index()
+    name = name.lower()
+    return agents.get(names.get(name, name))
+
+
+async def read_agent_index() -> AgentIndex:
+    """Read agent information from data/agents, and index the names.
+
+    Raises:
+        AgentReadError: If the files could not be read.
+
+    Returns:
+        Agent index.
+    """
+    try:
+        from rtoml import loads as load_toml
+    except ImportError:
+        from tomllib import loads as load_toml
 
-    def read_agents() -> list[Agent]:
-        """Read agent information.
+    def list_agents() -> tuple[list[Traversable], CacheKey | None]:
+        """List the agent files.
 
-        Stored in data/agents
+        Stored in data/agents.
 
         Returns:
-            List of agent dicts.
+            A tuple of the agent files, and a key to cache the parsed agents.
         """
-        agents: list[Agent] = []
-        try:
-            for file in files("toad.data").joinpath("agents").iterdir():
-                agent: Agent = tomllib.load(file.open("rb"))
-                if agent.get("active", True):
-                    agents.append(agent)
+        agent_files = list(files("toad.data").joinpath("agents").iterdir())
+        return agent_files, _get_cache_key(agent_files)
 
-        except Exception as error:
-            raise AgentReadError(f"Failed to read agents; {error}")
+    def read_agent(file: Traversable) -> Agent:
+        """Read a single agent file.
+
+        Args:
+            file: Agent file.
+
+        Returns:
+            Agent dict.
+        """
+        agent: Agent = load_toml(file.read_text(encoding="utf-8"))
+        return agent
 
-        return agents
+    try:
+        agent_files, cache_key = await asyncio.to_thread(list_agents)
+        if cache_key is not None and cache_key in _agents_cache:
+            return _agents_cache[cache_key]
+        # Files are independent, so may be read in parallel
+        agent_map = {
+            agent["identity"]: agent
+            for agent in await asyncio.gather(
+                *[asyncio.to_thread(read_agent, file) for file in agent_files]
+            )
+            if agent.get("active", True)
+        }
+    except Exception as error:
+        raise AgentReadError(f"Failed to read agents; {error}")
 
-    agents = await asyncio.to_thread(read_agents)
-    agent_map = {agent["identity"]: agent for agent in agents}
+    names: dict[str, str] = {}
+    for identity, agent in agent_map.items():
+        # An agent without a short name may still be found by its identity
+        if isinstance(short_name := agent.get("short_name"), str):
+            names.setdefault(short_name.lower(), identity)
+        names.setdefault(identity.lower(), identity)
+    agent_index = AgentIndex(agent_map, names)
 
-    return agent_map
+    if cache_key is not None:
+        _agents_cache.clear()
+        _agents_cache[cache_key] = agent_index
+    return agent_index
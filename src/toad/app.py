@@ -27,6 +27,7 @@ from toad.settings_schema import SCHEMA
 from toad.version import VersionMeta
 from toad import paths
 from toad import atomic
+from toad._threads import shutdown_io_executor
 
 if TYPE_CHECKING:
     from toad.screens.main import MainScreen
@@ -554,6 +555,9 @@ class ToadApp(App, inherit_bindings=False):
         self.set_timer(1, self.run_version_check)
         self.set_process_title()
 
+    def on_unmount(self) -> None:
+        shutdown_io_executor()
+
     @work(thread=True, exit_on_error=False)
     def set_process_title(self) -> None:
         try:
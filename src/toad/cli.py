@@ -1,8 +1,10 @@
 import sys
+from typing import TYPE_CHECKING
 
 import click
-from toad.app import ToadApp
-from toad.agent_schema import Agent
+
+if TYPE_CHECKING:
+    from toad.agent_schema import Agent
 
 
 def set_process_title(title: str) -> None:
@@ -33,24 +35,12 @@ def check_directory(path: str) -> None:
 
 
 async def get_agent_data(launch_agent) -> Agent | None:
-    launch_agent = launch_agent.lower()
-
-    from toad.agents import read_agents, AgentReadError
+    from toad.agents import find_agent, AgentReadError
 
     try:
-        agents = await read_agents()
+        return await find_agent(launch_agent)
     except AgentReadError:
-        agents = {}
-
-    for agent_data in agents.values():
-        if (
-            agent_data["short_name"].lower() == launch_agent
-            or agent_data["identity"].lower() == launch_agent
-        ):
-            launch_agent = agent_data["identity"]
-            break
-
-    return agents.get(launch_agent)
+        return None
 
 
 class DefaultCommandGroup(click.Group):
@@ -102,6 +92,7 @@ def main():
 @click.option("-s", "--serve", is_flag=True, help="Serve Toad as a web application")
 def run(port: int, host: str, serve: bool, project_dir: str = ".", agent: str = "1", public_url: str | None = None):
     """Run an installed agent (same as `toad PATH`)."""
+    from toad.app import ToadApp
 
     check_directory(project_dir)
 
@@ -224,6 +215,8 @@ def acp(
         server.serve()
 
     else:
+        from toad.app import ToadApp
+
         app = ToadApp(agent_data=agent_data, project_dir=project_dir)
         app.run()
         app.run_on_exit()
@@ -237,6 +230,8 @@ def acp(
 @main.command("settings")
 def settings() -> None:
     """Settings information."""
+    from toad.app import ToadApp
+
     app = ToadApp()
     print(f"{app.settings_path}")
 
@@ -258,7 +253,7 @@ def replay(path: str) -> None:
 
     stdout = sys.stdout.buffer
     with open(path, "rb") as replay_file:
-        for line in replay_file.readlines():
+        for line in replay_file:
             sender, space, json_line = line.partition(b" ")
             if sender == b"[agent]":
                 stdout.write(json_line.strip() + b"\n")
@@ -289,6 +284,7 @@ def about() -> None:
     """Show about information."""
 
     from toad import about
+    from toad.app import ToadApp
 
     app = ToadApp()
 
@@ -1,13 +1,21 @@
-from collections import defaultdict
+from collections import deque
 from typing import Iterable
 
+type Trie = dict[str, Trie]
+
+END = ""
+"""Key which marks the end of a word in the trie."""
+
+LEAF: Trie = {}
+"""Shared (empty) value for the end marker. Never modified, as it has no children."""
+
 
 class Complete:
     """Stores substrings and their potential completions."""
 
     def __init__(self) -> None:
         self._words: set[str] = set()
-        self._word_map: defaultdict[str, set[str]] = defaultdict(set)
+        self._root: Trie = {}
 
     def add_words(self, words: Iterable[str]) -> None:
         """Add word(s) word map.
@@ -15,16 +23,37 @@ class Complete:
         Args:
             words: Iterable of words to add.
         """
-        self._words.update(words)
-        word_map = self._word_map
         for word in words:
-            for index in range(1, len(word)):
-                word_map[word[:index]].add(word[index:])
+            if word in self._words:
+                continue
+            self._words.add(word)
+            node = self._root
+            for character in word:
+                node = node.setdefault(character, {})
+            node[END] = LEAF
 
     def __call__(self, word: str) -> list[str]:
-        if word in self._words:
+        if not word or word in self._words:
             return []
-        return sorted(self._word_map.get(word, []), key=len, reverse=True)
+        node = self._root
+        for character in word:
+            if (child := node.get(character)) is None:
+                return []
+            node = child
+        # A breadth first search finds completions in order of length,
+        # so there is no need to sort them.
+        completions: list[str] = []
+        queue: deque[tuple[str, Trie]] = deque([("", node)])
+        while queue:
+            prefix, node = queue.popleft()
+            for character, child in node.items():
+                if character == END:
+                    if prefix:
+                        completions.append(prefix)
+                else:
+                    queue.append((prefix + character, child))
+        completions.reverse()
+        return completions
 
 
 if __name__ == "__main__":
@@ -35,4 +64,4 @@ if __name__ == "__main__":
 
     from rich import print
 
-    print(complete._word_map)
+    print(complete._root)
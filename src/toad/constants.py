@@ -5,7 +5,7 @@ This module contains constants, which may be set in environment variables.
 from __future__ import annotations
 
 import os
-from typing import Final
+from typing import Callable, Final
 
 get_environ = os.environ.get
 
@@ -33,26 +33,40 @@ def _get_environ_int(
         default: The value to use if the value is not set, or set to something other
             than a valid integer.
         minimum: Optional minimum value.
+        maximum: Optional maximum value.
 
     Returns:
         The integer associated with the environment variable if it's set to a valid int
             or the default value otherwise.
     """
-    try:
-        value = int(os.environ[name])
-    except KeyError:
+    if (environ_value := get_environ(name)) is None:
         return default
+    try:
+        value = int(environ_value)
     except ValueError:
         return default
     if minimum is not None:
-        return max(minimum, value)
+        value = max(minimum, value)
     if maximum is not None:
-        return min(maximum, value)
+        value = min(maximum, value)
     return value
 
 
-ACP_INITIALIZE: Final[bool] = _get_environ_bool("TOAD_ACP_INITIALIZE", True)
+ACP_INITIALIZE: bool
 """Initialize ACP agents?"""
 
-DEBUG: Final[bool] = _get_environ_bool("DEBUG", False)
+DEBUG: bool
 """Debug flag."""
+
+_LAZY_CONSTANTS: Final[dict[str, Callable[[], object]]] = {
+    "ACP_INITIALIZE": lambda: _get_environ_bool("TOAD_ACP_INITIALIZE", True),
+    "DEBUG": lambda: _get_environ_bool("DEBUG", False),
+}
+
+
+def __getattr__(name: str) -> object:
+    # Constants are read from the environment on first access
+    if (get_constant := _LAZY_CONSTANTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = get_constant()
+    return value
@@ -1,189 +1,197 @@
 from enum import IntEnum
 from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, NamedTuple, Sequence
+from typing import Iterable, NamedTuple, Sequence, TYPE_CHECKING
 
 from textual.content import Span
 
+if TYPE_CHECKING:
+    from bashlex import ast
 
-SAFE_COMMANDS = {
-    # Display & Output
-    "echo",
-    "cat",
-    "less",
-    "more",
-    "head",
-    "tail",
-    "tac",
-    "nl",
-    # File & Directory Information
-    "ls",
-    "tree",
-    "pwd",
-    "file",
-    "stat",
-    "du",
-    "df",
-    # Search & Find
-    "find",
-    "locate",
-    "which",
-    "whereis",
-    "type",
-    "grep",
-    "egrep",
-    "fgrep",
-    # Text Processing (read-only)
-    "wc",
-    "sort",
-    "uniq",
-    "cut",
-    "paste",
-    "column",
-    "tr",
-    "diff",
-    "cmp",
-    "comm",
-    # System Information
-    "whoami",
-    "who",
-    "w",
-    "id",
-    "hostname",
-    "uname",
-    "uptime",
-    "date",
-    "cal",
-    "env",
-    "printenv",
-    # Process Information
-    "ps",
-    "top",
-    "htop",
-    "pgrep",
-    "jobs",
-    "pstree",
-    # Network (read-only operations)
-    "ping",
-    "traceroute",
-    "nslookup",
-    "dig",
-    "host",
-    "netstat",
-    "ss",
-    "ifconfig",
-    "ip",
-    # View compressed files (without extracting)
-    "zcat",
-    "zless",
-    # History & Help
-    "history",
-    "man",
-    "help",
-    "info",
-    "apropos",
-    "whatis",
-    # Comparison & Checksums
-    "md5sum",
-    "sha256sum",
-    "sha1sum",
-    "cksum",
-    "sum",
-    # Other Safe Commands
-    "bc",
-    "expr",
-    "test",
-    "sleep",
-    "true",
-    "false",
-    "yes",
-    "seq",
-    "basename",
-    "dirname",
-    "realpath",
-    "readlink",
-}
-
-UNSAFE_COMMANDS = {
-    # File/Directory Creation
-    "mkdir",
-    "touch",
-    "mktemp",
-    "mkfifo",
-    "mknod",
-    # File/Directory Deletion
-    "rm",
-    "rmdir",
-    "shred",
-    # File/Directory Moving/Copying
-    "mv",
-    "cp",
-    "rsync",
-    "scp",
-    "install",
-    # File Modification/Editing
-    "sed",  # with -i flag
-    "awk",  # can write files
-    "tee",  # writes to files and stdout
-    # Permissions/Ownership
-    "chmod",
-    "chown",
-    "chgrp",
-    "chattr",
-    "setfacl",
-    # Linking
-    "ln",
-    "link",
-    "unlink",
-    # Archive/Compression (extract/compress operations)
-    "tar",
-    "untar",
-    "zip",
-    "unzip",
-    "gzip",
-    "gunzip",
-    "bzip2",
-    "bunzip2",
-    "xz",
-    "unxz",
-    "7z",
-    "rar",
-    "unrar",
-    # Download Tools
-    "wget",
-    "curl",
-    "fetch",
-    "aria2c",
-    # Low-level Disk Operations
-    "dd",
-    "truncate",
-    "fallocate",
-    # File Splitting
-    "split",
-    "csplit",
-    # Synchronization
-    "sync",
-    # System Administration
-    "useradd",
-    "userdel",
-    "usermod",
-    "groupadd",
-    "groupdel",
-    "passwd",
-    "mount",
-    "umount",
-    "mkfs",
-    "fdisk",
-    "parted",
-    "swapon",
-    "swapoff",
-    # Other Potentially Dangerous
-    "patch",
-}
-
-
-COMMAND_SPLIT = {";", "&&", "||", "|"}
-CHANGE_DIRECTORY = {"cd"}
+SAFE_COMMANDS = frozenset(
+    {
+        # Display & Output
+        "echo",
+        "cat",
+        "less",
+        "more",
+        "head",
+        "tail",
+        "tac",
+        "nl",
+        # File & Directory Information
+        "ls",
+        "tree",
+        "pwd",
+        "file",
+        "stat",
+        "du",
+        "df",
+        # Search & Find
+        "find",
+        "locate",
+        "which",
+        "whereis",
+        "type",
+        "grep",
+        "egrep",
+        "fgrep",
+        # Text Processing (read-only)
+        "wc",
+        "sort",
+        "uniq",
+        "cut",
+        "paste",
+        "column",
+        "tr",
+        "diff",
+        "cmp",
+        "comm",
+        # System Information
+        "whoami",
+        "who",
+        "w",
+        "id",
+        "hostname",
+        "uname",
+        "uptime",
+        "date",
+        "cal",
+        "env",
+        "printenv",
+        # Process Information
+        "ps",
+        "top",
+        "htop",
+        "pgrep",
+        "jobs",
+        "pstree",
+        # Network (read-only operations)
+        "ping",
+        "traceroute",
+        "nslookup",
+        "dig",
+        "host",
+        "netstat",
+        "ss",
+        "ifconfig",
+        "ip",
+        # View compressed files (without extracting)
+        "zcat",
+        "zless",
+        # History & Help
+        "history",
+        "man",
+        "help",
+        "info",
+        "apropos",
+        "whatis",
+        # Comparison & Checksums
+        "md5sum",
+        "sha256sum",
+        "sha1sum",
+        "cksum",
+        "sum",
+        # Other Safe Commands
+        "bc",
+        "expr",
+        "test",
+        "sleep",
+        "true",
+        "false",
+        "yes",
+        "seq",
+        "basename",
+        "dirname",
+        "realpath",
+        "readlink",
+    }
+)
+
+UNSAFE_COMMANDS = frozenset(
+    {
+        # File/Directory Creation
+        "mkdir",
+        "touch",
+        "mktemp",
+        "mkfifo",
+        "mknod",
+        # File/Directory Deletion
+        "rm",
+        "rmdir",
+        "shred",
+        # File/Directory Moving/Copying
+        "mv",
+        "cp",
+        "rsync",
+        "scp",
+        "install",
+        # File Modification/Editing
+        "sed",  # with -i flag
+        "awk",  # can write files
+        "tee",  # writes to files and stdout
+        # Permissions/Ownership
+        "chmod",
+        "chown",
+        "chgrp",
+        "chattr",
+        "setfacl",
+        # Linking
+        "ln",
+        "link",
+        "unlink",
+        # Archive/Compression (extract/compress operations)
+        "tar",
+        "untar",
+        "zip",
+        "unzip",
+        "gzip",
+        "gunzip",
+        "bzip2",
+        "bunzip2",
+        "xz",
+        "unxz",
+        "7z",
+        "rar",
+        "unrar",
+        # Download Tools
+        "wget",
+        "curl",
+        "fetch",
+        "aria2c",
+        # Low-level Disk Operations
+        "dd",
+        "truncate",
+        "fallocate",
+        # File Splitting
+        "split",
+        "csplit",
+        # Synchronization
+        "sync",
+        # System Administration
+        "useradd",
+        "userdel",
+        "usermod",
+        "groupadd",
+        "groupdel",
+        "passwd",
+        "mount",
+        "umount",
+        "mkfs",
+        "fdisk",
+        "parted",
+        "swapon",
+        "swapoff",
+        # Other Potentially Dangerous
+        "patch",
+    }
+)
+
+
+COMMAND_SPLIT = frozenset({";", "&&", "||", "|"})
+CHANGE_DIRECTORY = frozenset({"cd"})
+# Characters which may introduce another command, or a redirect
+METACHARS = frozenset(";&|<>$`()\n")
 
 
 class DangerLevel(IntEnum):
@@ -208,7 +216,35 @@ class CommandAtom(NamedTuple):
     """Span to highlight error."""
 
 
-@lru_cache(maxsize=1024)
+@lru_cache(maxsize=4096)
+def detect_atoms(
+    project_directory: str, current_working_directory: str, command_line: str
+) -> tuple[tuple[CommandAtom, ...], DangerLevel]:
+    """Analyze a command, and get the overall danger level.
+
+    Args:
+        project_directory: Project directory.
+        current_working_directory: Current working directory.
+        command_line: Bash command.
+
+    Returns:
+        A tuple of command atoms, and a `DangerLevel` enumeration.
+    """
+    try:
+        atoms = tuple(
+            analyze(project_directory, current_working_directory, command_line)
+        )
+    except OSError:
+        return (), DangerLevel.UNKNOWN
+
+    if atoms:
+        danger_level = max(command_atom.level for command_atom in atoms)
+    else:
+        danger_level = DangerLevel.SAFE
+
+    return atoms, danger_level
+
+
 def detect(
     project_directory: str,
     current_working_directory: str,
@@ -229,12 +265,9 @@ def detect(
     Returns:
         A tuple of spans to highlight the command, and a `DangerLevel` enumeration.
     """
-    try:
-        atoms = list(
-            analyze(project_directory, current_working_directory, command_line)
-        )
-    except OSError:
-        return [], DangerLevel.UNKNOWN
+    atoms, danger_level = detect_atoms(
+        str(project_directory), str(current_working_directory), command_line
+    )
     spans: list[Span] = []
     for atom in atoms:
         if atom.level == DangerLevel.DANGEROUS and danger_style:
@@ -242,14 +275,39 @@ def detect(
         elif atom.level == DangerLevel.DESTRUCTIVE and destructive_style:
             spans.append(Span(*atom.span, destructive_style))
 
-    if atoms:
-        danger_level = max(command_atom.level for command_atom in atoms)
-    else:
-        danger_level = DangerLevel.SAFE
-
     return (spans, danger_level)
 
 
+@lru_cache(maxsize=16)
+def _resolve(path: str) -> Path:
+    """Resolve a directory, which is unlikely to change within a session.
+
+    Args:
+        path: A path.
+
+    Returns:
+        Resolved path.
+    """
+    return Path(path).resolve()
+
+
+@lru_cache(maxsize=2048)
+def _parse_bash(command_line: str) -> tuple[ast.node, ...]:
+    """Parse a bash command line.
+
+    The nodes are shared between calls, and should be treated as read-only.
+
+    Args:
+        command_line: A bash command line.
+
+    Returns:
+        A tuple of AST nodes.
+    """
+    import bashlex
+
+    return tuple(bashlex.parse(command_line))
+
+
 def analyze(
     project_directory: str, current_working_directory: str, command_line: str
 ) -> Iterable[CommandAtom]:
@@ -262,12 +320,23 @@ def analyze(
     Yields:
         `CommandAtom` objects.
     """
-    project_path = Path(project_directory).resolve()
-
-    import bashlex
-    from bashlex import ast
-
-    def recurse_nodes(root_path: Path, nodes: list[ast.node]) -> Iterable[CommandAtom]:
+    if METACHARS.isdisjoint(command_line):
+        # A single simple command; no need to parse if it is known to be safe
+        words = command_line.split(maxsplit=1)
+        if words and (command_name := words[0]) in SAFE_COMMANDS:
+            yield CommandAtom(
+                command_name,
+                DangerLevel.SAFE,
+                Path(current_working_directory),
+                (0, len(command_line)),
+            )
+            return
+
+    project_path = _resolve(project_directory)
+
+    def recurse_nodes(
+        root_path: Path, nodes: Sequence[ast.node]
+    ) -> Iterable[CommandAtom]:
         for node in nodes:
             kind: str = node.kind
 
@@ -299,9 +368,9 @@ def analyze(
                 continue
 
             change_directory = command_name in CHANGE_DIRECTORY
+            command_word = command_line[slice(*node.pos)]
 
             for command_node in parts:
-                command_word = command_line[slice(*node.pos)]
 
                 if command_node.kind == "redirect":
                     redirect = command_line[slice(*command_node.output.pos)]
@@ -333,6 +402,11 @@ def analyze(
                         pass
                     continue
 
+                if level in (DangerLevel.SAFE, DangerLevel.UNKNOWN):
+                    # The target path only matters for dangerous commands
+                    yield CommandAtom(command_word, level, root_path, node.pos)
+                    continue
+
                 try:
                     target_path = (root_path / Path(word)).expanduser().resolve()
                 except OSError:
@@ -345,9 +419,9 @@ def analyze(
 
                 yield CommandAtom(command_word, level, target_path, node.pos)
 
-    current_path = Path(current_working_directory)
+    current_path = _resolve(current_working_directory)
     try:
-        nodes = bashlex.parse(command_line)
+        nodes = _parse_bash(command_line)
     except Exception:
         # Failed to parse bash
         return
@@ -1,14 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-from itertools import filterfalse
+import os
 from typing import Callable
 from time import time
 from os import PathLike
 from pathlib import Path
 
-from textual._partition import partition
-
+from toad._threads import run_in_thread
 from toad.path_filter import PathFilter
 
 
@@ -19,15 +18,19 @@ class ScanJob:
         self,
         name: str,
         queue: asyncio.Queue[Path],
-        results: list[Path],
+        results: list[str],
         path_filter: PathFilter | None = None,
         add_directories=False,
+        prefix_length: int = 0,
+        on_queue: Callable[[], None] | None = None,
     ) -> None:
         self.queue = queue
         self.results = results
         self.name = name
         self.path_filter = path_filter
         self.add_directories = add_directories
+        self.prefix_length = prefix_length
+        self.on_queue = on_queue
 
     def start(self) -> None:
         self._task = asyncio.create_task(self.run())
@@ -35,28 +38,28 @@ class ScanJob:
     async def run(self) -> None:
         queue = self.queue
         results = self.results
-        add_directories = self.add_directories
         while True:
             try:
                 scan_path = await queue.get()
             except asyncio.QueueShutDown:
                 break
-            paths, dir_paths = await asyncio.to_thread(
+            paths, dir_paths = await run_in_thread(
                 self._scan_directory, scan_path, self.path_filter
             )
-            if add_directories:
-                results.extend(dir_paths)
             results.extend(paths)
             try:
+                # The queue is unbounded, so there is no need to await a put
                 for path in dir_paths:
-                    await queue.put(path)
+                    queue.put_nowait(path)
             except asyncio.QueueShutDown:
                 break
+            if dir_paths and self.on_queue is not None:
+                self.on_queue()
             queue.task_done()
 
     def _scan_directory(
         self, root: Path, path_filter: PathFilter | None = None
-    ) -> tuple[list[Path], list[Path]]:
+    ) -> tuple[list[str], list[Path]]:
         """Perform a directory scan (done in a thread).
 
         Args:
@@ -64,20 +67,33 @@ class ScanJob:
             path_filter: PathFilter object.
 
         Returns:
-            A tuple of lists of paths (FILES, DIRECTORIES)
+            A tuple of a list of relative paths to add to the results, and a list of
+                directories to scan.
         """
+        prefix_length = self.prefix_length
+        add_directories = self.add_directories
+        paths: list[str] = []
+        dir_paths: list[Path] = []
         try:
-            paths = list(root.iterdir())
-        except IOError:
-            paths = []
-        if path_filter is not None:
-            paths = list(filterfalse(path_filter.match, paths))
-
-        try:
-            paths, dir_paths = partition(Path.is_dir, paths)
-        except IOError:
-            paths = []
-            dir_paths = []
+            # DirEntry caches the file type, so checking for directories
+            # doesn't require a stat per path
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    path = Path(entry.path)
+                    if path_filter is not None and path_filter.match(path):
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        dir_paths.append(path)
+                        if add_directories:
+                            paths.append(f"{str(path)[prefix_length:]}/")
+                    else:
+                        paths.append(str(path)[prefix_length:])
+        except OSError:
+            pass
         return paths, dir_paths
 
 
@@ -88,35 +104,43 @@ async def scan(
     path_filter: PathFilter | None = None,
     add_directories: bool = False,
     max_duration: float | None = 5.0,
-) -> list[Path]:
+) -> list[str]:
     """Scan a directory for paths.
 
     Args:
         root: Root directory to scan.
-        max_simultaneous: Maximum number of scan jobs.
+        max_simultaneous: Maximum number of scan jobs, started as directories are discovered.
         path_filter: Path filter object.
         add_directories: Also collect directories?
         max_duration: Maximum time in seconds to scan for, or `None` for no maximum.
 
     Returns:
-        A list of Paths.
+        A list of paths relative to the root. Directories have a trailing "/".
     """
     queue: asyncio.Queue[Path] = asyncio.Queue()
-    results: list[Path] = []
-    jobs = [
-        ScanJob(
-            f"scan-job #{index}",
-            queue,
-            results,
-            path_filter=path_filter,
-            add_directories=add_directories,
-        )
-        for index in range(max_simultaneous)
-    ]
+    results: list[str] = []
+    # Length of the root, and separator (if any), in the paths of its children
+    prefix_length = len(str(root / "_")) - 1
+    jobs: list[ScanJob] = []
+
+    def add_jobs() -> None:
+        """Start jobs as directories are discovered, up to `max_simultaneous`."""
+        while len(jobs) < min(queue.qsize(), max_simultaneous):
+            job = ScanJob(
+                f"scan-job #{len(jobs)}",
+                queue,
+                results,
+                path_filter=path_filter,
+                add_directories=add_directories,
+                prefix_length=prefix_length,
+                on_queue=add_jobs,
+            )
+            jobs.append(job)
+            job.start()
+
     try:
         await queue.put(root)
-        for job in jobs:
-            job.start()
+        add_jobs()
         if max_duration is not None:
             try:
                 async with asyncio.timeout(max_duration):
@@ -152,12 +176,13 @@ class Scan:
         self._scan_task = asyncio.create_task(self._run(), name=f"scan {self.root!s}")
 
     async def _run(self) -> None:
-        await asyncio.to_thread(self._scan)
+        await run_in_thread(self._scan)
         self._complete_event.set()
         self._on_complete(self)
 
     def _scan(self) -> None:
-        self._scan_result = list(self.root.iterdir())
+        with os.scandir(self.root) as entries:
+            self._scan_result = [Path(entry.path) for entry in entries]
 
     async def wait(self) -> list[Path]:
         """Get the result of the scan, potentially waiting for it to finish first.
@@ -18,6 +18,7 @@ from watchdog.events import (
     DirMovedEvent,
 )
 from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
 from watchdog.observers.polling import PollingObserver
 
 
@@ -29,7 +30,7 @@ class DirectoryChanged(Message):
 
 
 @rich.repr.auto
-class DirectoryWatcher(threading.Thread, FileSystemEventHandler):
+class DirectoryWatcher(FileSystemEventHandler):
     """Watch for changes to a directory, ignoring purely file data changes."""
 
     def __init__(self, path: Path, widget: Widget) -> None:
@@ -41,9 +42,11 @@ class DirectoryWatcher(threading.Thread, FileSystemEventHandler):
         """
         self._path = path
         self._widget = widget
-        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._observer: BaseObserver | None = None
+        self._stopped = False
         self._enabled = False
-        super().__init__(name=repr(self))
+        super().__init__()
 
     @property
     def enabled(self) -> bool:
@@ -58,7 +61,16 @@ class DirectoryWatcher(threading.Thread, FileSystemEventHandler):
         yield self._path
         yield self._widget
 
-    def run(self) -> None:
+    def start(self) -> None:
+        """Start watching.
+
+        A recursive watch may need to walk the directory tree, so the observer is
+        started in a short-lived thread. Once started, events are handled by the
+        observer's own thread.
+        """
+        threading.Thread(target=self._start_observer, name=repr(self)).start()
+
+    def _start_observer(self) -> None:
         try:
             observer = Observer()
         except Exception:
@@ -79,18 +91,23 @@ class DirectoryWatcher(threading.Thread, FileSystemEventHandler):
                     DirMovedEvent,
                 ],
             )
-            observer.start()
+            with self._lock:
+                if self._stopped:
+                    return
+                observer.start()
+                self._observer = observer
+                self._enabled = True
         except Exception:
             return
-        self._enabled = True
-        while not self._stop_event.wait(1):
-            pass
-        try:
-            observer.stop()
-        except Exception:
-            pass
 
     def stop(self) -> None:
         """Stop the watcher."""
-
-        self._stop_event.set()
+        with self._lock:
+            self._stopped = True
+            observer = self._observer
+            self._observer = None
+        if observer is not None:
+            try:
+                observer.stop()
+            except Exception:
+                pass
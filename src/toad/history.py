@@ -1,4 +1,4 @@
-from typing import TypedDict
+from typing import TypedDict, cast
 import asyncio
 import json
 from pathlib import Path
@@ -6,7 +6,9 @@ from time import time
 
 import rich.repr
 
+from toad._threads import run_in_thread
 from toad.complete import Complete
+from toad.jsonrpc import loads as json_loads
 
 
 class HistoryEntry(TypedDict):
@@ -25,6 +27,9 @@ class History:
         self._lines: list[str] = []
         self._opened: bool = False
         self._current: str | None = None
+        self._pending_lines: list[str] = []
+        self._write_lock = asyncio.Lock()
+        self._write_success = True
         self.complete = Complete()
 
     def __rich_repr__(self) -> rich.repr.Result:
@@ -62,16 +67,20 @@ class History:
                 with self.path.open("r") as history_file:
                     self._lines = history_file.readlines()
 
-                inputs: list[str] = []
+                # Repeated commands are common, so only add each word once
+                inputs: set[str] = set()
                 for line in self._lines:
-                    if (input := json.loads(line).get("input")) is not None:
-                        inputs.append(input.split(" ", 1)[0])
+                    entry = json_loads(line)
+                    if isinstance(entry, dict) and isinstance(
+                        input := entry.get("input"), str
+                    ):
+                        inputs.add(input.split(" ", 1)[0])
                 self.complete.add_words(inputs)
             except Exception:
                 return False
             return True
 
-        self._opened = await asyncio.to_thread(read_history)
+        self._opened = await run_in_thread(read_history)
         return self._opened
 
     async def append(self, input: str) -> bool:
@@ -89,30 +98,51 @@ class History:
             return True
         self.complete.add_words([input.split(" ")[0]])
 
-        def write_line() -> bool:
-            """Append a line to the history.
+        if not self._opened:
+            await self.open()
+
+        history_entry: HistoryEntry = {
+            "input": input,
+            "timestamp": time(),
+        }
+        line = json.dumps(history_entry)
+        self._lines.append(line)
+        self._pending_lines.append(line)
+        if success := await self._write_pending():
+            self._current = None
+        return success
+
+    async def _write_pending(self) -> bool:
+        """Write pending lines to the history file.
+
+        Lines appended while a write is in progress are written together in the next write.
+
+        Returns:
+            `True` on success, `False` if write failed.
+        """
+
+        def write_lines(lines: list[str]) -> bool:
+            """Append lines to the history.
+
+            Args:
+                lines: Lines to append.
 
             Returns:
                 `True` on success, `False` if write failed.
             """
-            history_entry: HistoryEntry = {
-                "input": input,
-                "timestamp": time(),
-            }
-            line = json.dumps(history_entry)
-            self._lines.append(line)
             try:
                 with self.path.open("a") as history_file:
-                    history_file.write(f"{line}\n")
+                    history_file.write("".join(f"{line}\n" for line in lines))
             except Exception:
                 return False
-            self._current = None
             return True
 
-        if not self._opened:
-            await self.open()
-
-        return await asyncio.to_thread(write_line)
+        async with self._write_lock:
+            if self._pending_lines:
+                lines = self._pending_lines
+                self._pending_lines = []
+                self._write_success = await run_in_thread(write_lines, lines)
+        return self._write_success
 
     async def get_entry(self, index: int) -> HistoryEntry:
         """Get a history entry via its index.
@@ -134,5 +164,5 @@ class History:
             entry_line = self._lines[index]
         except IndexError:
             raise IndexError(f"No history entry at index {index}")
-        history_entry: HistoryEntry = json.loads(entry_line)
+        history_entry = cast(HistoryEntry, json_loads(entry_line))
         return history_entry
@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 from asyncio import Future, get_running_loop
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import wraps
 import inspect
 from inspect import signature
@@ -25,6 +25,50 @@ type JSONList = list[JSONType]
 
 log = logging.getLogger("jsonrpc")
 
+try:
+    import orjson
+except ImportError:
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+
+def dumps(obj: JSONType) -> bytes:
+    """Encode JSON.
+
+    Uses orjson if it is installed. Data orjson can't encode (such as integers
+    larger than 64 bits) is encoded with the standard library.
+
+    Args:
+        obj: Object to encode.
+
+    Returns:
+        UTF-8 encoded JSON.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def loads(data: bytes | str) -> JSONType:
+    """Decode JSON.
+
+    Uses orjson if it is installed. Note that orjson decodes integers larger than
+    64 bits as floats, which the standard library does not.
+
+    Args:
+        data: Encoded JSON.
+
+    Returns:
+        Decoded object.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def expose(name: str = "", prefix: str = ""):
     """Expose a method."""
@@ -66,6 +110,28 @@ class Method:
     name: str
     callable: Callable
     parameters: dict[str, Parameter]
+    defaults: dict[str, JSONType | NoDefault] = field(init=False)
+    """Default arguments."""
+    json_parameters: list[tuple[str, Parameter]] = field(init=False)
+    """Parameters which may be supplied in the JSONRPC call."""
+    server_parameters: list[str] = field(init=False)
+    """Names of parameters which should receive the server instance."""
+
+    def __post_init__(self) -> None:
+        # Computed once here, so the work isn't repeated for every call
+        self.defaults = {
+            name: parameter.default for name, parameter in self.parameters.items()
+        }
+        self.server_parameters = [
+            name
+            for name, parameter in self.parameters.items()
+            if inspect.isclass(parameter.type) and issubclass(parameter.type, Server)
+        ]
+        self.json_parameters = [
+            (name, parameter)
+            for name, parameter in self.parameters.items()
+            if name not in self.server_parameters
+        ]
 
 
 @rich.repr.auto
@@ -128,9 +194,41 @@ class Server:
         else:
             # Batch call
             response = await self._dispatch_batch(json)
-        log.debug(f"OUT {response}")
+        log.debug("OUT %r", response)
         return response
 
+    async def call_encoded(self, json: JSONObject | JSONList) -> bytes | None:
+        """Call a method (or methods in a batch), and encode the response.
+
+        Calls in a batch run concurrently, and responses are encoded as each call
+        completes, rather than building a list of responses to be encoded at the end.
+
+        Args:
+            json: A JSONRPC call, or batch of calls.
+
+        Returns:
+            Encoded response, or `None` if there is nothing to send.
+        """
+        if isinstance(json, dict):
+            if (response := await self._dispatch_object(json)) is None:
+                return None
+            log.debug("OUT %r", response)
+            return dumps(response)
+        encoded_responses: list[bytes] = []
+        for dispatch in asyncio.as_completed(
+            [
+                self._dispatch_object(request)
+                for request in json
+                if isinstance(request, dict)
+            ]
+        ):
+            if (response := await dispatch) is not None:
+                log.debug("OUT %r", response)
+                encoded_responses.append(dumps(response))
+        if not encoded_responses:
+            return None
+        return b"[%s]" % b",".join(encoded_responses)
+
     def expose_instance(self, instance: object) -> None:
         """Add methods from the given instance."""
         for method_name in dir(instance):
@@ -207,9 +305,7 @@ class Server:
                 "Invalid request; 'params' attribute should be a list or an object"
             )
 
-        arguments: dict[str, JSONType | Server | NoDefault] = {
-            name: parameter.default for name, parameter in method.parameters.items()
-        }
+        arguments: dict[str, JSONType | Server | NoDefault] = {**method.defaults}
 
         def validate(value: JSONType, parameter_type: type) -> None:
             """Validate types."""
@@ -226,16 +322,10 @@ class Server:
                 )
 
         if isinstance(params, list):
-            parameter_items = [
-                (name, parameter)
-                for name, parameter in method.parameters.items()
-                if not issubclass(parameter.type, Server)
-            ]
-            for (parameter_name, parameter), value in zip(parameter_items, params):
-                if issubclass(parameter.type, Server):
-                    value = self
-                else:
-                    validate(value, parameter.type)
+            for (parameter_name, parameter), value in zip(
+                method.json_parameters, params
+            ):
+                validate(value, parameter.type)
                 arguments[parameter_name] = value
         else:
             for parameter_name, value in params.items():
@@ -243,9 +333,8 @@ class Server:
                     validate(value, parameter.type)
                     arguments[parameter_name] = value
 
-        for name, parameter in method.parameters.items():
-            if inspect.isclass(parameter.type) and issubclass(parameter.type, Server):
-                arguments[name] = self
+        for name in method.server_parameters:
+            arguments[name] = self
 
         try:
             call_result = method.callable(**arguments)
@@ -257,10 +346,7 @@ class Server:
             error.id = request_id
             raise error
         except Exception as error:
-            # raise
-            # print("JSON error", repr(error))
-            # log.debug(f"Error in exposed JSONRPC method; {error}")
-            print("INTERNAL ERROR", error)
+            log.debug("Error in exposed JSONRPC method; %s", error)
             raise InternalError(str(error), id=request_id)
 
         if request_id is None:
@@ -271,13 +357,16 @@ class Server:
         return response_object
 
     async def _dispatch_batch(self, json: JSONList) -> list[JSONType]:
-        batch_results: list[JSONType] = []
-        for request in json:
-            if not isinstance(request, dict):
-                continue
-            result = await self._dispatch_object(request)
-            if result is not None:
-                batch_results.append(result)
+        results = await asyncio.gather(
+            *[
+                self._dispatch_object(request)
+                for request in json
+                if isinstance(request, dict)
+            ]
+        )
+        batch_results: list[JSONType] = [
+            result for result in results if result is not None
+        ]
         return batch_results
 
     def process_callable(
@@ -416,7 +505,7 @@ class Request:
     @property
     def body_json(self) -> bytes:
         """Dump the body as encoded json."""
-        body_json = json.dumps(self.body).encode("utf-8")
+        body_json = dumps(self.body)
         return body_json
 
 
@@ -1,7 +1,9 @@
 import asyncio
 import os
 from pathlib import Path
-from typing import Literal, Sequence
+from typing import Literal, NamedTuple, Sequence
+
+from toad._threads import run_in_thread
 
 
 def longest_common_prefix(strings: list[str]) -> str:
@@ -14,21 +16,17 @@ def longest_common_prefix(strings: list[str]) -> str:
     Returns:
         The longest common prefix string
     """
-    if not strings:
-        return ""
+    # Compares only the lexicographically smallest and largest strings
+    return os.path.commonprefix(strings)
 
-    # Start with the first string as reference
-    prefix: str = strings[0]
 
-    # Compare with each subsequent string
-    for current_string in strings[1:]:
-        # Reduce prefix until it matches the start of current string
-        while not current_string.startswith(prefix):
-            prefix = prefix[:-1]
-            if not prefix:
-                return ""
+class DirectoryEntry(NamedTuple):
+    """An entry in a directory listing."""
 
-    return prefix
+    name: str
+    """Name of the file or directory."""
+    is_dir: bool
+    """Is the entry a directory?"""
 
 
 class DirectoryReadTask:
@@ -37,32 +35,46 @@ class DirectoryReadTask:
     def __init__(self, path: Path) -> None:
         self.path = path
         self.done_event = asyncio.Event()
-        self.directory_listing: list[Path] = []
+        self.directory_listing: list[DirectoryEntry] = []
         self._task: asyncio.Task | None = None
 
     def read(self) -> None:
         # TODO: Should this be cancellable, or have a maximum number of paths for the case of very large directories?
-        for path in self.path.iterdir():
-            self.directory_listing.append(path)
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                self.directory_listing.append(DirectoryEntry(entry.name, is_dir))
 
     def start(self) -> None:
         asyncio.create_task(self.run(), name=f"DirectoryReadTask({str(self.path)!r})")
 
     async def run(self):
-        await asyncio.to_thread(self.read)
+        await run_in_thread(self.read)
         self.done_event.set()
 
-    async def wait(self) -> list[Path]:
+    async def wait(self) -> list[DirectoryEntry]:
         await self.done_event.wait()
         return self.directory_listing
 
 
+class DirectoryListing(NamedTuple):
+    """A cached directory listing."""
+
+    mtime_ns: int
+    """Modification time of the directory when it was read."""
+    entries: list[DirectoryEntry]
+    """Entries in the directory."""
+
+
 class PathComplete:
     """Auto completes paths."""
 
     def __init__(self) -> None:
         self.read_tasks: dict[Path, DirectoryReadTask] = {}
-        self.directory_listings: dict[Path, list[Path]] = {}
+        self.directory_listings: dict[Path, DirectoryListing] = {}
 
     async def __call__(
         self,
@@ -81,54 +93,52 @@ class PathComplete:
             node = directory_path.name
             directory_path = directory_path.parent
 
-        if (listing := self.directory_listings.get(directory_path)) is None:
-            read_task = DirectoryReadTask(directory_path)
-            self.read_tasks[directory_path] = read_task
-            read_task.start()
+        try:
+            mtime_ns = directory_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        cached_listing = self.directory_listings.get(directory_path)
+        if cached_listing is not None and cached_listing.mtime_ns == mtime_ns:
+            listing = cached_listing.entries
+        else:
+            if (read_task := self.read_tasks.get(directory_path)) is None:
+                read_task = DirectoryReadTask(directory_path)
+                self.read_tasks[directory_path] = read_task
+                read_task.start()
             listing = await read_task.wait()
+            self.read_tasks.pop(directory_path, None)
+            if mtime_ns is not None:
+                self.directory_listings[directory_path] = DirectoryListing(
+                    mtime_ns, listing
+                )
 
         if exclude_type is not None:
             if exclude_type == "dir":
-                listing = [
-                    listing_path
-                    for listing_path in listing
-                    if not listing_path.is_dir()
-                ]
+                listing = [entry for entry in listing if not entry.is_dir]
             else:
-                listing = [
-                    listing_path for listing_path in listing if listing_path.is_dir()
-                ]
+                listing = [entry for entry in listing if entry.is_dir]
 
         if not node:
-            return None, [listing_path.name for listing_path in listing]
+            return None, [entry.name for entry in listing]
 
-        matching_nodes = [
-            listing_path
-            for listing_path in listing
-            if listing_path.name.startswith(node)
-        ]
-        if not (matching_nodes):
+        matching_entries = [entry for entry in listing if entry.name.startswith(node)]
+        if not (matching_entries):
             # Nothing matches
             return None, None
 
         if not (
-            prefix := longest_common_prefix(
-                [node_path.name for node_path in matching_nodes]
-            )
+            prefix := longest_common_prefix([entry.name for entry in matching_entries])
         ):
             return None, None
 
-        picked_path = directory_path / prefix
-        path_size = (
-            len(str(Path(directory_path).expanduser().resolve())) + 1 + len(node)
-        )
-        completed_prefix = str(picked_path)[path_size:]
+        completed_prefix = prefix[len(node) :]
         path_options = [
-            str(path)[path_size + len(completed_prefix) :] for path in matching_nodes
+            entry.name[len(prefix) :]
+            for entry in matching_entries
+            if entry.name != prefix
         ]
-        path_options = [name for name in path_options if name]
 
-        if picked_path.is_dir() and not path_options:
+        if not path_options and matching_entries[0].is_dir:
             completed_prefix += os.sep
 
         return completed_prefix or None, path_options
@@ -1,4 +1,3 @@
-from itertools import chain
 from typing import Iterable, Sequence
 from pathlib import Path
 import pathspec
@@ -7,6 +6,12 @@ from pathspec import GitIgnoreSpec
 
 import rich.repr
 
+MAX_MATCH_CACHE = 50_000
+"""Maximum number of match results to cache."""
+
+NO_PATH_SPECS: tuple[GitIgnoreSpec, ...] = ()
+"""Shared by all directories without any applicable path specs."""
+
 
 def load_path_spec(git_ignore_path: Path) -> GitIgnoreSpec | None:
     """Get a path spec instance if there is a .gitignore file present.
@@ -44,8 +49,10 @@ class PathFilter:
         self, root: Path, path_specs: Iterable[GitIgnoreSpec] | None = None
     ) -> None:
         self._root = root
-        self._default_specs = [] if path_specs is None else list(path_specs)
-        self._path_specs: dict[Path, Sequence[GitIgnoreSpec]] = {}
+        self._default_specs = NO_PATH_SPECS if path_specs is None else tuple(path_specs)
+        self._path_specs: dict[Path, tuple[GitIgnoreSpec, ...]] = {}
+        self._match_cache: dict[str, bool] = {}
+        self._match_specs: dict[Path, Sequence[GitIgnoreSpec]] = {}
 
     def __rich_repr__(self) -> rich.repr.Result:
         yield (str(self._root),)
@@ -88,29 +95,77 @@ class PathFilter:
         """
         if (cached_path_specs := self._path_specs.get(path)) is not None:
             return cached_path_specs
-        path_spec = load_path_spec(path / ".gitignore")
-        if path == self._root:
-            path_specs = [path_spec] if path_spec is not None else []
-        else:
-            parent_path_specs = self.get_path_specs(path.parent)
-            path_specs = (
-                parent_path_specs
-                if path_spec is None
-                else [*parent_path_specs, path_spec]
-            )
-        self._path_specs[path] = path_specs
+        # Ascend to the root, or the nearest directory with cached specs
+        directories: list[Path] = []
+        path_specs = NO_PATH_SPECS
+        while True:
+            if (cached_path_specs := self._path_specs.get(path)) is not None:
+                path_specs = cached_path_specs
+                break
+            directories.append(path)
+            if path == self._root or (parent := path.parent) == path:
+                break
+            path = parent
+        # Then descend, inheriting path specs from each parent
+        for directory in reversed(directories):
+            if (path_spec := load_path_spec(directory / ".gitignore")) is not None:
+                path_specs = (*path_specs, path_spec)
+            self._path_specs[directory] = path_specs
         return path_specs
 
+    def get_match_specs(self, path: Path) -> Sequence[GitIgnoreSpec]:
+        """Get the path specs to match paths in a directory against.
+
+        If none of the specs negate a pattern, then a path is excluded if any pattern
+        matches, and the specs may be combined in to a single spec which is matched
+        in one pass.
+
+        Args:
+            path: A directory path.
+
+        Returns:
+            A sequence of path specs.
+        """
+        if (match_specs := self._match_specs.get(path)) is not None:
+            return match_specs
+        if self._default_specs:
+            match_specs = (*self._default_specs, *self.get_path_specs(path))
+        else:
+            match_specs = self.get_path_specs(path)
+        if len(match_specs) > 1:
+            patterns = [
+                pattern for path_spec in match_specs for pattern in path_spec.patterns
+            ]
+            if all(pattern.include is not False for pattern in patterns):
+                match_specs = (GitIgnoreSpec(patterns),)
+        self._match_specs[path] = match_specs
+        return match_specs
+
     def match(self, path: Path) -> bool:
         """Match a path againt the path filter.
 
+        Returns:
+            `True` if the path should be removed, `False` if it should be included.
+        """
+        cache_key = str(path)
+        if (cached_match := self._match_cache.get(cache_key)) is not None:
+            return cached_match
+        if len(self._match_cache) >= MAX_MATCH_CACHE:
+            self._match_cache.clear()
+        self._match_cache[cache_key] = match = self._match(path)
+        return match
+
+    def _match(self, path: Path) -> bool:
+        """Match a path against the path specs (uncached).
+
         Returns:
             `True` if the path should be removed, `False` if it should be included.
         """
         if path.name == ".git":
             return True
-        path_specs = self.get_path_specs(path.parent)
-        for path_spec in chain(self._default_specs, path_specs):
+        if not (match_specs := self.get_match_specs(path.parent)):
+            return False
+        for path_spec in match_specs:
             if path_spec.match_file(path):
                 return True
         return False
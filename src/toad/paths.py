@@ -1,12 +1,17 @@
-from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
 from typing import Final
 
 from xdg_base_dirs import xdg_config_home, xdg_data_home, xdg_state_home
 
+import toad
+
 
 APP_NAME: Final[str] = "toad"
 
+_created_directories: set[Path] = set()
+"""Directories which have been created (or found to exist) by this process."""
+
 
 def path_to_name(path: Path) -> str:
     """Converts a path to a name (suitable as a path component).
@@ -17,32 +22,64 @@ def path_to_name(path: Path) -> str:
     Returns:
         A stringified version of the path.
     """
-    name = str(path.resolve()).lstrip("/").replace("/", "-")
+    # Relative paths are made absolute, so the cache is valid if the cwd changes
+    return _resolve_name(str(path.absolute()))
+
+
+@lru_cache(maxsize=512)
+def _resolve_name(path: str) -> str:
+    """Resolve a path, and convert it to a name.
+
+    Cached, as resolving a path requires system calls. Symlinks changed after the
+    first call for a given path won't be reflected in the name.
+
+    Args:
+        path: A path.
+
+    Returns:
+        A stringified version of the resolved path.
+    """
+    name = str(Path(path).resolve())
+    if toad.os == "windows":
+        name = name.replace(":", "").replace("\\", "-")
+    name = name.lstrip("/").replace("/", "-")
     return name
 
 
+def ensure_directory(path: Path) -> Path:
+    """Create a directory if it doesn't already exist.
+
+    Once created, the directory isn't checked again for the lifetime of the process.
+
+    Args:
+        path: Path to directory.
+
+    Returns:
+        The path.
+    """
+    if path not in _created_directories:
+        try:
+            path.mkdir(0o700, exist_ok=True, parents=True)
+        except OSError:
+            pass
+        else:
+            _created_directories.add(path)
+    return path
+
+
 def get_data() -> Path:
     """Return (possibly creating) the application data directory."""
-    path = xdg_data_home() / APP_NAME
-    with suppress(OSError):
-        path.mkdir(0o700, exist_ok=True, parents=True)
-    return path
+    return ensure_directory(xdg_data_home() / APP_NAME)
 
 
 def get_config() -> Path:
     """Return (possibly creating) the application config directory."""
-    path = xdg_config_home() / APP_NAME
-    with suppress(OSError):
-        path.mkdir(0o700, exist_ok=True, parents=True)
-    return path
+    return ensure_directory(xdg_config_home() / APP_NAME)
 
 
 def get_state() -> Path:
     """Return (possibly creating) the application state directory."""
-    path = xdg_state_home() / APP_NAME
-    with suppress(OSError):
-        path.mkdir(0o700, exist_ok=True, parents=True)
-    return path
+    return ensure_directory(xdg_state_home() / APP_NAME)
 
 
 def get_project_data(project_path: Path) -> Path:
@@ -52,10 +89,7 @@ def get_project_data(project_path: Path) -> Path:
         project_path: Path of project.
 
     """
-    project_data_path = get_data() / path_to_name(project_path)
-    with suppress(OSError):
-        project_data_path.mkdir(0o700, exist_ok=True, parents=True)
-    return project_data_path
+    return ensure_directory(get_data() / path_to_name(project_path))
 
 
 def get_log() -> Path:
@@ -65,7 +99,4 @@ def get_log() -> Path:
         Path to log directory.
 
     """
-    path = get_state() / "logs"
-    with suppress(OSError):
-        path.mkdir(0o700, exist_ok=True, parents=True)
-    return path
+    return ensure_directory(get_state() / "logs")
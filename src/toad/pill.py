@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from textual.content import Content
 
 
@@ -12,7 +14,40 @@ def pill(text: Content | str, background: str, foreground: str) -> Content:
     Returns:
         Pill content.
     """
-    content = Content(text) if isinstance(text, str) else text
+    if isinstance(text, str):
+        return _pill_text(text, background, foreground)
+    return _pill(text, background, foreground)
+
+
+@lru_cache(maxsize=256)
+def _pill_text(text: str, background: str, foreground: str) -> Content:
+    """Format a string as a pill.
+
+    Content is immutable, and the styles are resolved when rendered (so remain valid
+    after a theme change), which makes the result safe to share.
+
+    Args:
+        text: Pill text.
+        background: Background color.
+        foreground: Foreground color.
+
+    Returns:
+        Pill content.
+    """
+    return _pill(Content(text), background, foreground)
+
+
+def _pill(content: Content, background: str, foreground: str) -> Content:
+    """Format content as a pill.
+
+    Args:
+        content: Pill contents.
+        background: Background color.
+        foreground: Foreground color.
+
+    Returns:
+        Pill content.
+    """
     main_style = f"{foreground} on {background}"
     end_style = f"{background} on transparent r"
     pill_content = Content.assemble(
@@ -1,3 +1,4 @@
+from functools import cache
 import shutil
 
 from textual.app import ComposeResult
@@ -16,6 +17,16 @@ from toad.widgets.command_pane import CommandPane
 UV_INSTALL = "curl -LsSf https://astral.sh/uv/install.sh | sh"
 
 
+@cache
+def has_uv() -> bool:
+    """Check if uv is on the path (cached, as it requires a stat per directory).
+
+    Returns:
+        `True` if uv was found, otherwise `False`.
+    """
+    return shutil.which("uv") is not None
+
+
 class ActionModal(ModalScreen):
     """Executes an action command."""
 
@@ -71,14 +82,20 @@ class ActionModal(ModalScreen):
     async def run_command(self) -> None:
         """Write and execute the command."""
         self.command_pane.anchor()
-        if self._bootstrap_uv and shutil.which("uv") is None:
-            # Bootstrap UV if required
-            await self.command_pane.write(f"$ {UV_INSTALL}\n")
-            await self.command_pane.execute(UV_INSTALL, final=False)
-
-        await self.command_pane.write(f"$ {self._command}\n")
-        action_task = self.command_pane.execute(self._command)
+        command = self._command
+        bootstrap_uv = self._bootstrap_uv and not has_uv()
+        if bootstrap_uv:
+            # Bootstrap UV if required, in the same shell as the command
+            await self.command_pane.write(f"$ {UV_INSTALL}\n$ {command}\n")
+            command = f"({UV_INSTALL}) && {command}"
+        else:
+            await self.command_pane.write(f"$ {command}\n")
+
+        action_task = self.command_pane.execute(command)
         await action_task
+        if bootstrap_uv:
+            # uv may now be installed
+            has_uv.cache_clear()
         self.app.capture_event(
             "agent-action",
             action=self._action,
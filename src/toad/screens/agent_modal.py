@@ -1,4 +1,10 @@
-from typing import cast
+from collections.abc import MutableMapping
+from contextlib import suppress
+from functools import cache
+from typing import Any
+
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
 
 from textual import on
 from textual import getters
@@ -10,11 +16,76 @@ from textual.screen import ModalScreen
 from textual import containers
 from textual import widgets
 from textual.reactive import var
+from textual.timer import Timer
 
 import toad
 from textual.binding import Binding
-from toad.agent_schema import Action, Agent, OS, Command
+from toad.agent_schema import Action, Agent, Command
 from toad.app import ToadApp
+from toad.screens.action_modal import ActionModal
+from toad.screens.command_edit_modal import CommandEditModal
+
+
+class HelpMarkdownIt(MarkdownIt):
+    """A Markdown parser which caches the tokens for agent help."""
+
+    def __init__(self) -> None:
+        super().__init__("gfm-like")
+        self._tokens: dict[str, list[Token]] = {}
+
+    def parse(
+        self, src: str, env: MutableMapping[str, Any] | None = None
+    ) -> list[Token]:
+        if env is not None:
+            return super().parse(src, env)
+        if (tokens := self._tokens.get(src)) is None:
+            tokens = self._tokens[src] = super().parse(src)
+        return tokens
+
+
+@cache
+def get_help_parser() -> MarkdownIt:
+    """Get a parser for agent help, shared by all agent modals.
+
+    Returns:
+        A Markdown parser.
+    """
+    return HelpMarkdownIt()
+
+
+INSTALL_ACTIONS = frozenset({"install", "install_acp"})
+"""Actions which add the agent to the launcher when successful."""
+
+LAUNCHER_UPDATE_DELAY = 0.1
+"""Delay (in seconds) to coalesce changes to the launcher."""
+
+type ScriptChoices = tuple[tuple[str, str], ...]
+
+_script_choices: dict[str, ScriptChoices] = {}
+
+
+def get_script_choices(
+    agent: Agent, commands: dict[Action, Command] | None
+) -> ScriptChoices:
+    """Get the choices for the actions select, cached per agent.
+
+    Args:
+        agent: Agent dict.
+        commands: The agent's commands for this OS.
+
+    Returns:
+        A tuple of (DESCRIPTION, ACTION) tuples.
+    """
+    identity = agent["identity"]
+    if (script_choices := _script_choices.get(identity)) is None:
+        script_choices = _script_choices[identity] = (
+            *[
+                (action["description"], name)
+                for name, action in (commands or {}).items()
+            ],
+            (f"Launch {agent['name']}", "__launch__"),
+        )
+    return script_choices
 
 
 class DescriptionContainer(containers.VerticalScroll):
@@ -36,36 +107,30 @@ class AgentModal(ModalScreen):
     app = getters.app(ToadApp)
     action_select = getters.query_one("#action-select", widgets.Select)
     launcher_checkbox = getters.query_one("#launcher-checkbox", widgets.Checkbox)
+    go_button = getters.query_one("#run-action", widgets.Button)
 
     def __init__(self, agent: Agent) -> None:
         self._agent = agent
+        self._commands: dict[Action, Command] | None = toad.get_os_matrix(
+            agent["actions"]
+        )
+        self._pending_launcher_agents: list[str] | None = None
+        self._launcher_timer: Timer | None = None
         super().__init__()
 
     def compose(self) -> ComposeResult:
-        launcher_set = frozenset(
-            self.app.settings.get("launcher.agents", str).splitlines()
-        )
-
-        agent = self._agent
-
-        app = self.app
-        launcher_set = frozenset(app.settings.get("launcher.agents", str).splitlines())
         agent = self._agent
-        actions = agent["actions"]
-
-        script_os = cast(OS, toad.os)
-        if script_os not in actions:
-            script_os = "*"
-
-        commands: dict[Action, Command] = actions[cast(OS, script_os)]
-        script_choices = [
-            (action["description"], name) for name, action in commands.items()
-        ]
-        script_choices.append((f"Launch {agent['name']}", "__launch__"))
+        in_launcher = agent["identity"] in self.app.settings.get_lines(
+            "launcher.agents"
+        )
+        commands = self._commands or {}
+        script_choices = get_script_choices(agent, self._commands)
 
         with containers.Vertical(id="container"):
             with DescriptionContainer(id="description-container"):
-                yield widgets.Markdown(agent["help"], id="description")
+                yield widgets.Markdown(
+                    agent["help"], id="description", parser_factory=get_help_parser
+                )
             with containers.VerticalGroup():
                 if "install_acp" in commands:
                     yield widgets.Static(
@@ -77,7 +142,7 @@ class AgentModal(ModalScreen):
                 with containers.HorizontalGroup():
                     yield widgets.Checkbox(
                         "Show in launcher",
-                        value=agent["identity"] in launcher_set,
+                        value=in_launcher,
                         id="launcher-checkbox",
                     )
                     yield widgets.Select(
@@ -96,13 +161,35 @@ class AgentModal(ModalScreen):
 
     @on(widgets.Checkbox.Changed)
     def on_checkbox_changed(self, event: widgets.Select.Changed) -> None:
-        launcher_agents = self.app.settings.get("launcher.agents", str).splitlines()
+        if (launcher_agents := self._pending_launcher_agents) is None:
+            launcher_agents = list(self.app.settings.get_lines("launcher.agents"))
         agent_identity = self._agent["identity"]
-        if agent_identity in launcher_agents:
+        with suppress(ValueError):
             launcher_agents.remove(agent_identity)
         if event.value:
             launcher_agents.insert(0, agent_identity)
-        self.app.settings.set("launcher.agents", "\n".join(launcher_agents))
+        # Coalesce rapid toggles in to a single update of the launcher
+        self._pending_launcher_agents = launcher_agents
+        if self._launcher_timer is not None:
+            self._launcher_timer.stop()
+        self._launcher_timer = self.set_timer(
+            LAUNCHER_UPDATE_DELAY, self._update_launcher
+        )
+
+    def _update_launcher(self) -> None:
+        """Write any pending launcher changes to settings."""
+        if self._launcher_timer is not None:
+            self._launcher_timer.stop()
+            self._launcher_timer = None
+        if (launcher_agents := self._pending_launcher_agents) is not None:
+            self._pending_launcher_agents = None
+            self.app.settings.set("launcher.agents", "\n".join(launcher_agents))
+
+    def on_unmount(self) -> None:
+        # Don't lose pending updates, however the screen is removed
+        if self._pending_launcher_agents is not None:
+            self._update_launcher()
+            self.app.save_settings()
 
     @on(widgets.Select.Changed)
     def on_select_changed(self, event: widgets.Select.Changed) -> None:
@@ -119,11 +206,7 @@ class AgentModal(ModalScreen):
             self.dismiss("launch")
             return
 
-        agent_actions = self._agent["actions"]
-
-        if (commands := agent_actions.get(toad.os, None)) is None:
-            commands = agent_actions.get("*", None)
-        if commands is None:
+        if (commands := self._commands) is None:
             self.notify(
                 "Action is not available on this platform",
                 title="Agent action",
@@ -132,9 +215,6 @@ class AgentModal(ModalScreen):
             return
         command = commands[action]
 
-        from toad.screens.action_modal import ActionModal
-        from toad.screens.command_edit_modal import CommandEditModal
-
         title = command["description"]
         agent_id = self._agent["identity"]
         action_command = command["command"]
@@ -160,7 +240,7 @@ class AgentModal(ModalScreen):
                 bootstrap_uv=bootstrap_uv,
             )
         )
-        if return_code == 0 and action in {"install", "install-acp"}:
+        if return_code == 0 and action in INSTALL_ACTIONS:
             # Add to launcher if we installed something
             if not self.launcher_checkbox.value:
                 self.notify(
@@ -171,5 +251,4 @@ class AgentModal(ModalScreen):
                 self.launcher_checkbox.value = True
 
     def watch_action(self, action: str) -> None:
-        go_button = self.query_one("#run-action", widgets.Button)
-        go_button.disabled = not action
+        self.go_button.disabled = not action
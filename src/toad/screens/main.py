@@ -1,13 +1,14 @@
-from functools import partial
+from functools import cache, lru_cache, partial
 from pathlib import Path
 import random
 
-from textual import on
+from textual import events, on
 from textual.app import ComposeResult
 from textual import getters
 from textual.binding import Binding
 from textual.command import Hit, Hits, Provider, DiscoveryHit
 from textual.content import Content
+from textual.css.query import NoMatches
 from textual.screen import Screen
 from textual.reactive import var, reactive
 from textual.widgets import Footer, OptionList, DirectoryTree, Tree
@@ -26,6 +27,34 @@ from toad.widgets.project_directory_tree import ProjectDirectoryTree
 from toad.widgets.side_bar import SideBar
 
 
+@lru_cache(maxsize=1024)
+def get_letters(text: str, case_sensitive: bool) -> frozenset[str]:
+    """Get the set of letters in a string.
+
+    Args:
+        text: Text to scan.
+        case_sensitive: Preserve case, otherwise letters will be lower case.
+
+    Returns:
+        Set of letters.
+    """
+    return frozenset(text if case_sensitive else text.lower())
+
+
+@cache
+def get_quotes() -> list[Content]:
+    """Get the loading quotes, shuffled once per process.
+
+    Returns:
+        A list of Content objects.
+    """
+    from toad.app import QUOTES
+
+    quotes = [Content(quote) for quote in QUOTES]
+    random.shuffle(quotes)
+    return quotes
+
+
 class ModeProvider(Provider):
     async def search(self, query: str) -> Hits:
         """Search for Python files."""
@@ -34,10 +63,13 @@ class ModeProvider(Provider):
         screen = self.screen
         assert isinstance(screen, MainScreen)
 
-        for mode in sorted(
-            screen.conversation.modes.values(), key=lambda mode: mode.name
-        ):
+        case_sensitive = matcher.case_sensitive
+        query_letters = get_letters(query, case_sensitive)
+        for mode in screen.conversation.sorted_modes:
             command = mode.name
+            # A fuzzy match requires every letter of the query
+            if not query_letters <= get_letters(command, case_sensitive):
+                continue
             score = matcher.match(command)
             if score > 0:
                 yield Hit(
@@ -51,9 +83,7 @@ class ModeProvider(Provider):
         screen = self.screen
         assert isinstance(screen, MainScreen)
 
-        for mode in sorted(
-            screen.conversation.modes.values(), key=lambda mode: mode.name
-        ):
+        for mode in screen.conversation.sorted_modes:
             yield DiscoveryHit(
                 mode.name,
                 partial(screen.conversation.set_mode, mode.id),
@@ -87,6 +117,8 @@ class MainScreen(Screen, can_focus=False):
         super().__init__()
         self.set_reactive(MainScreen.project_path, project_path)
         self._agent = agent
+        self._pending_suggestion: str | None = None
+        self._side_bar_focused = False
 
     def watch_title(self, title: str) -> None:
         self.app.update_terminal_title()
@@ -94,12 +126,15 @@ class MainScreen(Screen, can_focus=False):
     def get_loading_widget(self) -> Widget:
         throbber = self.app.settings.get("ui.throbber", str)
         if throbber == "quotes":
-            from toad.app import QUOTES
             from toad.widgets.future_text import FutureText
 
-            quotes = QUOTES.copy()
-            random.shuffle(quotes)
-            return FutureText([Content(quote) for quote in quotes])
+            quotes = get_quotes()
+            future_text = FutureText(quotes)
+            # Start from a random quote, rather than re-shuffling
+            future_text.set_reactive(
+                FutureText.text_offset, random.randrange(len(quotes))
+            )
+            return future_text
         return super().get_loading_widget()
 
     def compose(self) -> ComposeResult:
@@ -138,20 +173,28 @@ class MainScreen(Screen, can_focus=False):
     @on(acp_messages.Plan)
     async def on_acp_plan(self, message: acp_messages.Plan):
         message.stop()
-        entries = [
-            Plan.Entry(
-                Content(entry["content"]),
-                entry.get("priority", "medium"),
-                entry.get("status", "pending"),
-            )
-            for entry in message.entries
-        ]
-        self.query_one("SideBar Plan", Plan).entries = entries
+        plan = self.query_one("SideBar Plan", Plan)
+        # Reuse unchanged entries from the previous plan
+        previous_entries = {
+            (entry.content.plain, entry.priority, entry.status): entry
+            for entry in plan.entries or ()
+        }
+        entries: list[Plan.Entry] = []
+        for entry in message.entries:
+            content = entry["content"]
+            priority = entry.get("priority", "medium")
+            status = entry.get("status", "pending")
+            if (
+                plan_entry := previous_entries.get((content, priority, status))
+            ) is None:
+                plan_entry = Plan.Entry(Content(content), priority, status)
+            entries.append(plan_entry)
+        plan.entries = entries
 
     def on_mount(self) -> None:
-        for tree in self.query("#project_directory_tree").results(DirectoryTree):
-            tree.data_bind(path=MainScreen.project_path)
         for tree in self.query(DirectoryTree):
+            if tree.id == "project_directory_tree":
+                tree.data_bind(path=MainScreen.project_path)
             #     tree.show_guides = False
             tree.guide_depth = 3
 
@@ -160,10 +203,36 @@ class MainScreen(Screen, can_focus=False):
         self, event: OptionList.OptionHighlighted
     ) -> None:
         if event.option.id is not None:
-            self.conversation.prompt.suggest(event.option.id)
+            # Coalesce a burst of highlights (e.g. key repeat) in to a single suggestion
+            if self._pending_suggestion is None:
+                self.call_later(self._suggest)
+            self._pending_suggestion = event.option.id
+
+    def _suggest(self) -> None:
+        """Suggest the most recently highlighted option."""
+        if (suggestion := self._pending_suggestion) is not None:
+            self._pending_suggestion = None
+            self.conversation.prompt.suggest(suggestion)
+
+    def _update_side_bar_focused(self) -> None:
+        """Update the side bar focus state, used by `check_action`."""
+        try:
+            side_bar_focused = self.side_bar.has_focus_within
+        except NoMatches:
+            return
+        if side_bar_focused != self._side_bar_focused:
+            self._side_bar_focused = side_bar_focused
+            self.refresh_bindings()
+
+    def on_descendant_focus(self, event: events.DescendantFocus) -> None:
+        self._update_side_bar_focused()
+
+    def on_descendant_blur(self, event: events.DescendantBlur) -> None:
+        self._update_side_bar_focused()
 
     def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
-        if action == "show_sidebar" and self.side_bar.has_focus_within:
+        # Focus within the side bar is tracked from focus events, as this is called often
+        if action == "show_sidebar" and self._side_bar_focused:
             return False
         return True
 
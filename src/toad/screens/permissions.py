@@ -1,3 +1,4 @@
+import asyncio
 import os
 from textual import work, on
 from textual.app import ComposeResult
@@ -18,79 +19,6 @@ from textual.widgets.option_list import Option
 
 from toad.app import ToadApp
 
-SOURCE1 = '''\
-def loop_first(values: Iterable[T]) -> Iterable[tuple[bool, T]]:
-    """Iterate and generate a tuple with a flag for first value."""
-    iter_values = iter(values)
-    try:
-        value = next(iter_values)
-    except StopIteration:
-        return
-    yield True, value
-    for value in iter_values:
-        yield False, value
-
-
-def loop_first_last(values: Iterable[T]) -> Iterable[tuple[bool, T]]:
-    """Iterate and generate a tuple with a flag for first and last value."""
-    iter_values = iter(values)
-    try:
-        previous_value = next(iter_values)
-    except StopIteration:
-        return
-    first = True
-    for value in iter_values:
-        yield first, False, previous_value
-        first = False
-        previous_value = value
-    yield first, True, previous_value
-
-'''
-
-SOURCE2 = '''\
-def loop_first(values: Iterable[T]) -> Iterable[tuple[bool, T]]:
-    """Iterate and generate a tuple with a flag for first value.
-    
-    Args:
-        values: iterables of values.
-
-    Returns:
-        Iterable of a boolean to indicate first value, and a value from the iterable.
-    """
-    iter_values = iter(values)
-    try:
-        value = next(iter_values)
-    except StopIteration:
-        return
-    yield True, value
-    for value in iter_values:
-        yield False, value
-
-
-def loop_last(values: Iterable[T]) -> Iterable[tuple[bool, bool, T]]:
-    """Iterate and generate a tuple with a flag for last value."""
-    iter_values = iter(values)
-    try:
-        previous_value = next(iter_values)
-    except StopIteration:
-        return
-    for value in iter_values:
-        yield False, previous_value
-        previous_value = value
-    yield True, previous_value
-
-
-def loop_first_last(values: Iterable[ValueType]) -> Iterable[tuple[bool, bool, ValueType]]:
-    """Iterate and generate a tuple with a flag for first and last value."""
-    iter_values = iter(values)
-    try:
-        previous_value = next(iter_values)  # Get previous value
-    except StopIteration:
-        return
-    first = True
-
-'''
-
 
 class PermissionsQuestion(Question):
     BINDING_GROUP_TITLE = "Permissions Options"
@@ -192,6 +120,8 @@ class PermissionsScreen(Screen[Answer]):
         super().__init__(name=name, id=id, classes=classes)
         self.options = options
         self.diffs = diffs
+        self._diff_views: dict[str, DiffView] = {}
+        """Mapping of option id on to diff view."""
 
     def get_diff_type(self) -> str:
         app = self.app
@@ -247,10 +177,6 @@ class PermissionsScreen(Screen[Answer]):
         return True
 
     async def on_mount(self):
-        app = self.app
-        if isinstance(app, ToadApp):
-            diff_view_setting = app.settings.get("diff.view", str)
-            self.query_one("#diff-select", Select).value = diff_view_setting
         self.navigator.highlighted = 0
 
         self._add_diffs()
@@ -263,29 +189,45 @@ class PermissionsScreen(Screen[Answer]):
             return
         diffs = self.diffs[:]
         self.diffs = None
-        for diff in diffs:
-            await self.add_diff(*diff)
+        await self.add_diffs(diffs)
 
     async def add_diff(
         self, path1: str, path2: str, before: str | None, after: str
     ) -> None:
-        self.index += 1
-        option_id = f"item-{self.index}"
-        diff_view = DiffView(path1, path2, before or "", after, id=option_id)
-        await diff_view.prepare()
-        app = self.app
-        if isinstance(app, ToadApp):
-            diff_view_setting = app.settings.get("diff.view", str)
-            diff_view.split = diff_view_setting == "split"
-            diff_view.auto_split = diff_view_setting == "auto"
-        await self.tool_container.mount(diff_view)
+        await self.add_diffs([(path1, path2, before, after)])
 
-        option_text = f"📄 {os.path.basename(path1)}"
-        self.navigator.add_option(Option(option_text, option_id))
+    async def add_diffs(self, diffs: list[tuple[str, str, str | None, str]]) -> None:
+        """Add a number of diffs, mounted in a single batch.
+
+        Args:
+            diffs: List of diffs to display, tuples of (PATH1, PATH2, SOURCE1, SOURCE2)
+        """
+        diff_views: dict[str, DiffView] = {}
+        options: list[Option] = []
+        for path1, path2, before, after in diffs:
+            self.index += 1
+            option_id = f"item-{self.index}"
+            diff_views[option_id] = DiffView(
+                path1, path2, before or "", after, id=option_id
+            )
+            options.append(Option(f"📄 {os.path.basename(path1)}", option_id))
+        if not diff_views:
+            return
+        await asyncio.gather(
+            *[diff_view.prepare() for diff_view in diff_views.values()]
+        )
+        diff_type = self.diff_type
+        for diff_view in diff_views.values():
+            diff_view.split = diff_type == "split"
+            diff_view.auto_split = diff_type == "auto"
+        await self.tool_container.mount_all(diff_views.values())
+        self._diff_views.update(diff_views)
+        self.navigator.add_options(options)
 
     @on(OptionList.OptionHighlighted)
     def on_option_highlighted(self, event: OptionList.OptionHighlighted):
-        self.tool_container.query_one(f"#{event.option_id}").scroll_visible(top=True)
+        if (diff_view := self._diff_views.get(event.option_id or "")) is not None:
+            diff_view.scroll_visible(top=True)
 
     @on(Question.Answer)
     def on_question_answer(self, event: Question.Answer) -> None:
@@ -297,9 +239,13 @@ class PermissionsScreen(Screen[Answer]):
     @on(Select.Changed, "#diff-select")
     def on_diff_select(self, event: Select.Changed) -> None:
         diff_type = event.value
-        for diff_view in self.query(DiffView):
-            diff_view.auto_split = diff_type == "auto"
-            diff_view.split = diff_type == "split"
+        assert isinstance(diff_type, str)
+        self.diff_type = diff_type
+        auto_split = diff_type == "auto"
+        split = diff_type == "split"
+        for diff_view in self._diff_views.values():
+            diff_view.auto_split = auto_split
+            diff_view.split = split
 
     def action_next(self) -> None:
         self.navigator.action_cursor_down()
@@ -109,7 +109,7 @@ Your favorite agents.
         self.post_message(StoreScreen.OpenAgentDetails(agent_item._agent["identity"]))
 
     def action_remove(self) -> None:
-        agents = self.app.settings.get("launcher.agents", str).splitlines()
+        agents = list(self.app.settings.get_lines("launcher.agents"))
         if self.highlighted is None:
             return
         try:
@@ -159,15 +159,7 @@ class Launcher(containers.VerticalGroup):
         return self
 
     def compose(self) -> ComposeResult:
-        launcher_agents = list(
-            dict.fromkeys(
-                identity
-                for identity in self.app.settings.get(
-                    "launcher.agents", str
-                ).splitlines()
-                if identity.strip()
-            )
-        )
+        launcher_agents = self.app.settings.get_lines("launcher.agents")
         agents = self._agents
         self.set_class(not launcher_agents, "-empty")
         if launcher_agents:
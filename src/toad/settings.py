@@ -240,6 +240,7 @@ class Settings:
         self._settings = settings
         self._on_set_callback = on_set_callback
         self._changed: bool = False
+        self._lines_cache: dict[str, tuple[str, ...]] = {}
 
     @property
     def changed(self) -> bool:
@@ -305,6 +306,26 @@ class Settings:
                 return default
         assert False, "Can't get here"
 
+    def get_lines(self, key: str) -> tuple[str, ...]:
+        """Get a text setting as unique, non-blank lines.
+
+        The lines are cached (after environment variables are expanded), until any
+        setting is next set.
+
+        Args:
+            key: Key in dot notation.
+
+        Returns:
+            A tuple of lines, in the order they first appear.
+        """
+        if (lines := self._lines_cache.get(key)) is None:
+            lines = self._lines_cache[key] = tuple(
+                dict.fromkeys(
+                    line for line in self.get(key, str).splitlines() if line.strip()
+                )
+            )
+        return lines
+
     def set(self, key: str, value: object) -> None:
         """Set a setting value.
 
@@ -313,6 +334,8 @@ class Settings:
             value: New value.
         """
         current_value = self.get(key, expand=False)
+        # Setting a parent key may change any number of cached keys
+        self._lines_cache.clear()
 
         updated_settings = copy.deepcopy(self._settings)
 
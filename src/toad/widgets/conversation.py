@@ -354,6 +354,7 @@ class Conversation(containers.Vertical):
         self._mouse_down_offset: Offset | None = None
 
         self._focusable_terminals: list[Terminal] = []
+        self._sorted_modes: tuple[Mode, ...] = ()
 
         self.project_data_path = paths.get_project_data(project_path)
         self.shell_history = History(self.project_data_path / "shell_history.jsonl")
@@ -883,6 +884,14 @@ class Conversation(containers.Vertical):
     ) -> None:
         self.working_directory = str(Path(event.path).resolve().absolute())
 
+    @property
+    def sorted_modes(self) -> tuple[Mode, ...]:
+        """The agent's modes, sorted by name."""
+        return self._sorted_modes
+
+    def watch_modes(self, modes: dict[str, Mode]) -> None:
+        self._sorted_modes = tuple(sorted(modes.values(), key=attrgetter("name")))
+
     def watch_busy_count(self, busy: int) -> None:
         self.throbber.set_class(busy > 0, "-busy")
 
@@ -138,7 +138,7 @@ class PathSearch(containers.VerticalGroup):
         return PathFuzzySearch(case_sensitive=False)
 
     root: var[Path] = var(Path("./"))
-    paths: var[list[Path]] = var(list)
+    paths: var[list[str]] = var(list)
     highlighted_paths: var[list[Content]] = var(list)
     filtered_path_indices: var[list[int]] = var(list)
     loaded = var(False)
@@ -346,8 +346,6 @@ class PathSearch(containers.VerticalGroup):
             paths = await directory.scan(
                 root, path_filter=path_filter, add_directories=True
             )
-
-            paths = [path.absolute() for path in paths]
             self.root = root
             self.paths = paths
         finally:
@@ -366,20 +364,10 @@ class PathSearch(containers.VerticalGroup):
         content = content.highlight_regex(r"\.[^/]*$", style="italic")
         return content
 
-    def watch_paths(self, paths: list[Path]) -> None:
+    def watch_paths(self, paths: list[str]) -> None:
         self.option_list.highlighted = None
 
-        def path_display(path: Path) -> str:
-            try:
-                is_directory = path.is_dir()
-            except OSError:
-                is_directory = False
-            if is_directory:
-                return str(path.relative_to(self.root)) + "/"
-            else:
-                return str(path.relative_to(self.root))
-
-        display_paths = sorted(map(path_display, paths), key=str.lower)
+        display_paths = sorted(paths, key=str.lower)
         self.highlighted_paths = [self.highlight_path(path) for path in display_paths]
         self.option_list.set_options(
             [
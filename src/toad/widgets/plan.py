@@ -52,7 +52,7 @@ class Plan(containers.Grid):
 
     """
 
-    @dataclass(frozen=True)
+    @dataclass(frozen=True, slots=True)
     class Entry:
         """Information about an entry in the Plan."""
 